@@ -0,0 +1,77 @@
+"""
+Numeric kernels for batch repricing.
+
+Compiled with numba when it is installed, falling back to NumPy otherwise.
+Both versions perform the same floating point operations in the same order
+as MedicareCalculator, so batch results match per-line pricing exactly.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _pfs_allowed_amounts_numpy(
+    rvus: np.ndarray,
+    gpcis: np.ndarray,
+    conversion_factor: float,
+    mppr_factors: np.ndarray,
+    units: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy implementation of pfs_allowed_amounts."""
+    base_payment = (
+        rvus[:, 0] * gpcis[:, 0] + rvus[:, 1] * gpcis[:, 1] + rvus[:, 2] * gpcis[:, 2]
+    ) * conversion_factor
+    return base_payment, base_payment * mppr_factors * units
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _pfs_allowed_amounts_numba(rvus, gpcis, conversion_factor, mppr_factors, units):
+        """Numba implementation of pfs_allowed_amounts."""
+        n = rvus.shape[0]
+        base_payment = np.empty(n)
+        allowed = np.empty(n)
+        for i in prange(n):
+            base = (
+                rvus[i, 0] * gpcis[i, 0] + rvus[i, 1] * gpcis[i, 1] + rvus[i, 2] * gpcis[i, 2]
+            ) * conversion_factor
+            base_payment[i] = base
+            allowed[i] = base * mppr_factors[i] * units[i]
+        return base_payment, allowed
+
+
+def pfs_allowed_amounts(
+    rvus: np.ndarray,
+    gpcis: np.ndarray,
+    conversion_factor: float,
+    mppr_factors: np.ndarray,
+    units: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute PFS payments for many lines at once.
+
+    Args:
+        rvus: Float array of shape (n, 3) with modifier-adjusted work/pe/mp RVUs
+        gpcis: Float array of shape (n, 3) with work/pe/mp GPCIs
+        conversion_factor: Medicare conversion factor
+        mppr_factors: Float array of MPPR multipliers (1.0 or 0.5)
+        units: Array of unit counts
+
+    Returns:
+        Tuple of (base payment array, allowed amount array)
+    """
+    if njit is not None:
+        return _pfs_allowed_amounts_numba(
+            np.ascontiguousarray(rvus, dtype=np.float64),
+            np.ascontiguousarray(gpcis, dtype=np.float64),
+            float(conversion_factor),
+            np.ascontiguousarray(mppr_factors, dtype=np.float64),
+            np.ascontiguousarray(units, dtype=np.float64)
+        )
+    return _pfs_allowed_amounts_numpy(rvus, gpcis, conversion_factor, mppr_factors, units)
@@ -8,11 +8,42 @@ Implements official Medicare payment formulas including:
 - Modifier adjustments
 """
 
-from typing import Optional, Tuple, List
-from .fee_schedule import MedicareFeeSchedule, RVUData, GPCIData, AnesthesiaBaseUnitData, AnesthesiaData
+from typing import NamedTuple, Optional, Tuple, List
+from .fee_schedule import (
+    MedicareFeeSchedule, RVUData, GPCIData, RVURow, GPCIRow, AnesthesiaBaseUnitData, AnesthesiaData
+)
 import math
 
 
+# Place of service codes priced with facility RVUs
+FACILITY_POS_CODES = frozenset({
+    "21", "22", "23", "24", "26", "31", "34",
+    "51", "52", "53", "56", "61"
+})
+
+
+class PFSResult(NamedTuple):
+    """Calculation details for a Physician Fee Schedule line."""
+
+    procedure_code: str
+    modifiers: Optional[List[str]]
+    work_rvu: float
+    pe_rvu: float
+    mp_rvu: float
+    work_gpci: float
+    pe_gpci: float
+    mp_gpci: float
+    conversion_factor: float
+    base_payment: float
+    mppr_adjustment: float
+    units: int
+    allowed_amount: float
+    is_facility: bool
+    locality: str
+    locality_name: str
+    notes: List[str]
+
+
 class MedicareCalculator:
     """
     Calculates Medicare allowed amounts using the Physician Fee Schedule formula.
@@ -46,6 +77,9 @@ class MedicareCalculator:
         units: int = 1,
         is_multiple_procedure: bool = False,
         procedure_rank: int = 1,
+        rvu: Optional[RVUData] = None,
+        gpci: Optional[GPCIData] = None,
+        is_facility: Optional[bool] = None,
     ) -> Tuple[float, dict]:
         """
         Calculate Medicare allowed amount for a procedure.
@@ -58,6 +92,9 @@ class MedicareCalculator:
             units: Number of units
             is_multiple_procedure: Whether this is part of multiple procedures
             procedure_rank: Rank when multiple procedures (1=highest, 2=second, etc.)
+            rvu: Optional RVU data already looked up by the caller
+            gpci: Optional GPCI data already looked up by the caller
+            is_facility: Optional facility flag already derived from place_of_service
 
         Returns:
             Tuple of (allowed_amount, calculation_details)
@@ -66,26 +103,104 @@ class MedicareCalculator:
             ValueError: If procedure code or locality not found
         """
         # Get RVU data - use first modifier for lookup if available
+        if rvu is None:
+            first_modifier = modifiers[0] if modifiers and len(modifiers) > 0 else None
+            rvu_row = self.fee_schedule.get_rvu_row(procedure_code, first_modifier)
+        else:
+            rvu_row = rvu.as_row()
+
+        # Get GPCI data, falling back to national average
+        if gpci is None:
+            gpci_row = self._resolve_gpci_row(locality)
+        else:
+            gpci_row = gpci.as_row()
+
+        error = self._missing_data_error(procedure_code, locality, rvu_row, gpci_row)
+        if error:
+            raise ValueError(error)
+
+        allowed_amount, result = self.calculate_allowed_amount_unchecked(
+            procedure_code=procedure_code,
+            place_of_service=place_of_service,
+            locality=locality,
+            rvu_row=rvu_row,
+            gpci_row=gpci_row,
+            modifiers=modifiers,
+            units=units,
+            is_multiple_procedure=is_multiple_procedure,
+            procedure_rank=procedure_rank,
+            is_facility=is_facility
+        )
+        return allowed_amount, result._asdict()
+
+    def can_price(
+        self,
+        procedure_code: str,
+        locality: str,
+        modifiers: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Check whether a procedure can be priced without raising.
+
+        Args:
+            procedure_code: CPT or HCPCS code
+            locality: Medicare locality code
+            modifiers: Optional list of procedure modifiers (up to 2)
+
+        Returns:
+            None if the procedure can be priced, otherwise the error message
+            calculate_allowed_amount would raise
+        """
         first_modifier = modifiers[0] if modifiers and len(modifiers) > 0 else None
-        rvu = self.fee_schedule.get_rvu(procedure_code, first_modifier)
-        if not rvu:
-            raise ValueError(f"Procedure code {procedure_code} not found in fee schedule")
+        rvu_row = self.fee_schedule.get_rvu_row(procedure_code, first_modifier)
+        gpci_row = self._resolve_gpci_row(locality) if rvu_row else None
+        return self._missing_data_error(procedure_code, locality, rvu_row, gpci_row)
 
-        # Get GPCI data
-        gpci = self.fee_schedule.get_gpci(locality)
-        if not gpci:
-            # Fall back to national average
-            gpci = self.fee_schedule.get_gpci("00")
-            if not gpci:
-                raise ValueError(f"Locality {locality} not found and no default available")
+    def calculate_allowed_amount_unchecked(
+        self,
+        procedure_code: str,
+        place_of_service: str,
+        locality: str,
+        rvu_row: RVURow,
+        gpci_row: GPCIRow,
+        modifiers: Optional[List[str]] = None,
+        units: int = 1,
+        is_multiple_procedure: bool = False,
+        procedure_rank: int = 1,
+        is_facility: Optional[bool] = None,
+    ) -> Tuple[float, PFSResult]:
+        """
+        Calculate Medicare allowed amount from already resolved fee schedule data.
+
+        Callers must have checked the procedure with can_price (or resolved
+        the RVU and GPCI rows themselves); no lookups or validation are
+        repeated here.
+
+        Args:
+            procedure_code: CPT or HCPCS code
+            place_of_service: Two-digit POS code
+            locality: Medicare locality code
+            rvu_row: RVU row for the procedure (see MedicareFeeSchedule.get_rvu_row)
+            gpci_row: GPCI row for the locality, or the national default
+            modifiers: Optional list of procedure modifiers (up to 2)
+            units: Number of units
+            is_multiple_procedure: Whether this is part of multiple procedures
+            procedure_rank: Rank when multiple procedures (1=highest, 2=second, etc.)
+            is_facility: Optional facility flag already derived from place_of_service
 
+        Returns:
+            Tuple of (allowed_amount, PFSResult with the calculation details)
+        """
         # Determine facility vs non-facility based on place of service
-        is_facility = self._is_facility_setting(place_of_service)
+        if is_facility is None:
+            is_facility = self._is_facility_setting(place_of_service)
 
-        # Get appropriate RVUs
-        work_rvu = rvu.work_rvu_f if is_facility else rvu.work_rvu_nf
-        pe_rvu = rvu.pe_rvu_f if is_facility else rvu.pe_rvu_nf
-        mp_rvu = rvu.mp_rvu_f if is_facility else rvu.mp_rvu_nf
+        # Get appropriate RVUs; facility values follow non-facility values
+        offset = 1 if is_facility else 0
+        work_rvu = rvu_row[offset]
+        pe_rvu = rvu_row[2 + offset]
+        mp_rvu = rvu_row[4 + offset]
+        work_gpci, pe_gpci, mp_gpci, locality_name = gpci_row
 
         # Apply modifier adjustments (sequentially for multiple modifiers)
         work_rvu, pe_rvu, mp_rvu, modifier_notes = self._apply_modifier_adjustments(
@@ -93,9 +208,9 @@ class MedicareCalculator:
         )
 
         # Calculate base payment
-        work_component = work_rvu * gpci.work_gpci
-        pe_component = pe_rvu * gpci.pe_gpci
-        mp_component = mp_rvu * gpci.mp_gpci
+        work_component = work_rvu * work_gpci
+        pe_component = pe_rvu * pe_gpci
+        mp_component = mp_rvu * mp_gpci
 
         base_payment = (work_component + pe_component + mp_component) * self.fee_schedule.conversion_factor
 
@@ -103,7 +218,7 @@ class MedicareCalculator:
         mppr_adjustment = 1.0
         mppr_note = None
 
-        if is_multiple_procedure and procedure_rank > 1 and rvu.mp_indicator == 2:
+        if is_multiple_procedure and procedure_rank > 1 and rvu_row[6] == 2:
             # Standard MPPR: 50% reduction for second and subsequent procedures
             mppr_adjustment = 0.50
             mppr_note = f"MPPR 50% applied (procedure rank {procedure_rank})"
@@ -111,34 +226,52 @@ class MedicareCalculator:
         # Calculate final allowed amount
         allowed_amount = base_payment * mppr_adjustment * units
 
+        # Modifier notes come back as a new list, so MPPR notes can be added to it
+        notes = modifier_notes
+        if mppr_note:
+            notes.append(mppr_note)
+
         # Build calculation details
-        details = {
-            "procedure_code": procedure_code,
-            "modifiers": modifiers,
-            "work_rvu": work_rvu,
-            "pe_rvu": pe_rvu,
-            "mp_rvu": mp_rvu,
-            "work_gpci": gpci.work_gpci,
-            "pe_gpci": gpci.pe_gpci,
-            "mp_gpci": gpci.mp_gpci,
-            "conversion_factor": self.fee_schedule.conversion_factor,
-            "base_payment": base_payment,
-            "mppr_adjustment": mppr_adjustment,
-            "units": units,
-            "allowed_amount": allowed_amount,
-            "is_facility": is_facility,
-            "locality": locality,
-            "locality_name": gpci.locality_name,
-            "notes": []
-        }
+        return allowed_amount, PFSResult(
+            procedure_code=procedure_code,
+            modifiers=modifiers,
+            work_rvu=work_rvu,
+            pe_rvu=pe_rvu,
+            mp_rvu=mp_rvu,
+            work_gpci=work_gpci,
+            pe_gpci=pe_gpci,
+            mp_gpci=mp_gpci,
+            conversion_factor=self.fee_schedule.conversion_factor,
+            base_payment=base_payment,
+            mppr_adjustment=mppr_adjustment,
+            units=units,
+            allowed_amount=allowed_amount,
+            is_facility=is_facility,
+            locality=locality,
+            locality_name=locality_name,
+            notes=notes
+        )
 
-        # Add modifier notes
-        if modifier_notes:
-            details["notes"].extend(modifier_notes)
-        if mppr_note:
-            details["notes"].append(mppr_note)
+    def _resolve_gpci_row(self, locality: str) -> Optional[GPCIRow]:
+        """Get the GPCI row for a locality, falling back to the national average."""
+        gpci_row = self.fee_schedule.get_gpci_row(locality)
+        if not gpci_row:
+            gpci_row = self.fee_schedule.get_gpci_row("00")
+        return gpci_row
 
-        return allowed_amount, details
+    @staticmethod
+    def _missing_data_error(
+        procedure_code: str,
+        locality: str,
+        rvu: Optional[RVURow],
+        gpci: Optional[GPCIRow]
+    ) -> Optional[str]:
+        """Describe missing RVU or GPCI data, or return None when both are present."""
+        if not rvu:
+            return f"Procedure code {procedure_code} not found in fee schedule"
+        if not gpci:
+            return f"Locality {locality} not found and no default available"
+        return None
 
     def _is_facility_setting(self, place_of_service: str) -> bool:
         """
@@ -169,11 +302,7 @@ class MedicareCalculator:
         Returns:
             True if facility setting, False otherwise
         """
-        facility_pos_codes = {
-            "21", "22", "23", "24", "26", "31", "34",
-            "51", "52", "53", "56", "61"
-        }
-        return place_of_service in facility_pos_codes
+        return place_of_service in FACILITY_POS_CODES
 
     def _apply_modifier_adjustments(
         self,
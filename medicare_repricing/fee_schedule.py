@@ -2,11 +2,76 @@
 Medicare Fee Schedule data structures and management.
 """
 
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import json
+import os
+import pickle
+import sys
+import tempfile
 from pathlib import Path
 
+try:
+    # ijson picks its fastest available backend (yajl2_c when installed)
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the pickled record layout changes to invalidate existing caches
+_CACHE_FORMAT_VERSION = 1
+
+# Plain tuple forms of RVU and GPCI data for the per-line pricing path.
+# RVU rows hold (work_nf, work_f, pe_nf, pe_f, mp_nf, mp_f, mp_indicator), so
+# a component's facility value sits one past its non-facility value.
+RVURow = Tuple[float, float, float, float, float, float, int]
+# GPCI rows hold (work_gpci, pe_gpci, mp_gpci, locality_name)
+GPCIRow = Tuple[float, float, float, str]
+
+
+def _load_json(f) -> Any:
+    """
+    Decode a whole JSON file, using orjson when it is installed.
+
+    Args:
+        f: File object opened in binary mode
+
+    Returns:
+        The decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+
+def _iter_json_items(f) -> Iterator[Any]:
+    """
+    Iterate over the items of a top-level JSON array.
+
+    Streams items one at a time with ijson when it is installed, so large
+    files never materialize as a full list of dicts. Falls back to
+    ``_load_json`` otherwise.
+
+    Args:
+        f: File object opened in binary mode
+
+    Returns:
+        Iterator over the decoded array items
+    """
+    if ijson is not None:
+        return ijson.items(f, 'item', use_float=True)
+    return iter(_load_json(f))
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a lookup-key string so equal codes share one object (None passes through)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 @dataclass
 class RVUData:
@@ -30,6 +95,19 @@ class RVUData:
     # 0 = No adjustment, 2 = Standard MPPR (50% for second and subsequent)
     mp_indicator: int = 0
 
+    def __post_init__(self):
+        self.procedure_code = _intern(self.procedure_code)
+        self.modifier = _intern(self.modifier)
+
+    def as_row(self) -> RVURow:
+        """Return the RVUs and MPPR indicator as an RVURow tuple."""
+        return (
+            self.work_rvu_nf, self.work_rvu_f,
+            self.pe_rvu_nf, self.pe_rvu_f,
+            self.mp_rvu_nf, self.mp_rvu_f,
+            self.mp_indicator
+        )
+
 
 @dataclass
 class GPCIData:
@@ -41,6 +119,13 @@ class GPCIData:
     pe_gpci: float
     mp_gpci: float
 
+    def __post_init__(self):
+        self.locality = _intern(self.locality)
+
+    def as_row(self) -> GPCIRow:
+        """Return the GPCIs and locality name as a GPCIRow tuple."""
+        return (self.work_gpci, self.pe_gpci, self.mp_gpci, self.locality_name)
+
 
 @dataclass
 class OPPSData:
@@ -54,6 +139,12 @@ class OPPSData:
     facility_price: float
     non_facility_price: float
 
+    def __post_init__(self):
+        self.hcpcs = _intern(self.hcpcs)
+        self.modifier = _intern(self.modifier)
+        self.carrier = _intern(self.carrier)
+        self.locality = _intern(self.locality)
+
 
 @dataclass
 class AnesthesiaData:
@@ -64,6 +155,10 @@ class AnesthesiaData:
     locality_name: str
     conversion_factor: float
 
+    def __post_init__(self):
+        self.contractor = _intern(self.contractor)
+        self.locality = _intern(self.locality)
+
 
 @dataclass
 class AnesthesiaBaseUnitData:
@@ -73,6 +168,9 @@ class AnesthesiaBaseUnitData:
     base_units: int
     description: str
 
+    def __post_init__(self):
+        self.procedure_code = _intern(self.procedure_code)
+
 
 @dataclass
 class MSDRGData:
@@ -84,6 +182,9 @@ class MSDRGData:
     geometric_mean_los: float  # Geometric mean length of stay
     arithmetic_mean_los: float  # Arithmetic mean length of stay
 
+    def __post_init__(self):
+        self.ms_drg = _intern(self.ms_drg)
+
 
 @dataclass
 class WageIndexData:
@@ -94,6 +195,9 @@ class WageIndexData:
     wage_index: float  # Operating wage index
     capital_wage_index: Optional[float] = None  # Capital geographic adjustment factor (GAF)
 
+    def __post_init__(self):
+        self.cbsa_code = _intern(self.cbsa_code)
+
 
 @dataclass
 class HospitalData:
@@ -118,6 +222,10 @@ class HospitalData:
     # Other
     bed_count: Optional[int] = None
 
+    def __post_init__(self):
+        self.provider_number = _intern(self.provider_number)
+        self.cbsa_code = _intern(self.cbsa_code)
+
 
 class MedicareFeeSchedule:
     """
@@ -137,7 +245,7 @@ class MedicareFeeSchedule:
         self.conversion_factor = conversion_factor
         self.rvu_data: Dict[str, RVUData] = {}
         self.gpci_data: Dict[str, GPCIData] = {}
-        self.opps_data: Dict[str, OPPSData] = {}
+        self.opps_data: Dict[Tuple[str, Optional[str], str, str], OPPSData] = {}
         self.anesthesia_data: Dict[str, AnesthesiaData] = {}
         self.anesthesia_base_units: Dict[str, AnesthesiaBaseUnitData] = {}
 
@@ -154,14 +262,27 @@ class MedicareFeeSchedule:
         self.ipps_outlier_threshold: float = 46217.00  # Fixed-loss threshold
         self.ipps_outlier_payment_rate: float = 0.80  # 80% of costs above threshold
 
+        # Tuple rows and NumPy views of the RVU and GPCI data, built on first use
+        self._rvu_rows: Optional[Dict[str, RVURow]] = None
+        self._gpci_rows: Optional[Dict[str, GPCIRow]] = None
+        self._rvu_arrays = None
+        self._gpci_arrays = None
+
+        # Locality to anesthesia contractor index, built on first use
+        self._anesthesia_contractors: Optional[Dict[str, str]] = None
+
     def add_rvu(self, rvu: RVUData) -> None:
         """Add RVU data for a procedure code."""
         key = self._make_rvu_key(rvu.procedure_code, rvu.modifier)
         self.rvu_data[key] = rvu
+        self._rvu_rows = None
+        self._rvu_arrays = None
 
     def add_gpci(self, gpci: GPCIData) -> None:
         """Add GPCI data for a locality."""
         self.gpci_data[gpci.locality] = gpci
+        self._gpci_rows = None
+        self._gpci_arrays = None
 
     def add_opps(self, opps: OPPSData) -> None:
         """Add OPPS data for a procedure code."""
@@ -172,6 +293,7 @@ class MedicareFeeSchedule:
         """Add anesthesia conversion factor data for a locality."""
         key = f"{anes.contractor}:{anes.locality}"
         self.anesthesia_data[key] = anes
+        self._anesthesia_contractors = None
 
     def add_anesthesia_base_unit(self, base_unit: AnesthesiaBaseUnitData) -> None:
         """Add anesthesia base unit data for a procedure code."""
@@ -222,6 +344,127 @@ class MedicareFeeSchedule:
         """
         return self.gpci_data.get(locality)
 
+    def get_rvu_row(self, procedure_code: str, modifier: Optional[str] = None) -> Optional[RVURow]:
+        """
+        Get RVU data for a procedure code as a plain tuple.
+
+        Uses the same modifier fallback as get_rvu.
+
+        Args:
+            procedure_code: CPT or HCPCS code
+            modifier: Optional modifier
+
+        Returns:
+            RVURow if found, None otherwise
+        """
+        rows = self._rvu_rows
+        if rows is None:
+            rows = self._rvu_rows = {key: rvu.as_row() for key, rvu in self.rvu_data.items()}
+
+        # Try with modifier first
+        if modifier:
+            row = rows.get(self._make_rvu_key(procedure_code, modifier))
+            if row is not None:
+                return row
+
+        # Fall back to code without modifier
+        return rows.get(self._make_rvu_key(procedure_code, None))
+
+    def get_rvu_rows(self, keys: Iterable[Tuple[str, Optional[str]]]) -> List[Optional[RVURow]]:
+        """
+        Get RVU rows for many (procedure code, modifier) pairs at once.
+
+        Uses the same modifier fallback as get_rvu_row.
+
+        Args:
+            keys: (procedure_code, modifier) pairs
+
+        Returns:
+            List of RVURow (or None when not found), one per pair
+        """
+        rows = self._rvu_rows
+        if rows is None:
+            rows = self._rvu_rows = {key: rvu.as_row() for key, rvu in self.rvu_data.items()}
+        get_row = rows.get
+        make_rvu_key = self._make_rvu_key
+
+        results: List[Optional[RVURow]] = []
+        for procedure_code, modifier in keys:
+            row = get_row(make_rvu_key(procedure_code, modifier)) if modifier else None
+            if row is None:
+                row = get_row(procedure_code)
+            results.append(row)
+        return results
+
+    def get_gpci_row(self, locality: str) -> Optional[GPCIRow]:
+        """
+        Get GPCI data for a locality as a plain tuple.
+
+        Args:
+            locality: Medicare locality code
+
+        Returns:
+            GPCIRow if found, None otherwise
+        """
+        rows = self._gpci_rows
+        if rows is None:
+            rows = self._gpci_rows = {locality: gpci.as_row() for locality, gpci in self.gpci_data.items()}
+        return rows.get(locality)
+
+    def rvu_arrays(self):
+        """
+        Get the RVU data as a NumPy array for vectorized pricing.
+
+        The array is built once and reused until RVU data is added.
+
+        Returns:
+            Tuple of (dictionary mapping RVU key to row index, float array of
+            shape (n, 6) with columns work/pe/mp non-facility RVUs followed by
+            work/pe/mp facility RVUs, int8 array of MPPR indicators)
+        """
+        if self._rvu_arrays is None:
+            import numpy as np
+
+            index = {key: row for row, key in enumerate(self.rvu_data)}
+            values = np.array(
+                [
+                    (rvu.work_rvu_nf, rvu.pe_rvu_nf, rvu.mp_rvu_nf,
+                     rvu.work_rvu_f, rvu.pe_rvu_f, rvu.mp_rvu_f)
+                    for rvu in self.rvu_data.values()
+                ],
+                dtype=np.float64
+            ).reshape(-1, 6)
+            mp_indicators = np.array(
+                [rvu.mp_indicator for rvu in self.rvu_data.values()],
+                dtype=np.int8
+            )
+            self._rvu_arrays = (index, values, mp_indicators)
+        return self._rvu_arrays
+
+    def gpci_arrays(self):
+        """
+        Get the GPCI data as a NumPy array for vectorized pricing.
+
+        The array is built once and reused until GPCI data is added.
+
+        Returns:
+            Tuple of (dictionary mapping locality to row index, float array of
+            shape (n, 3) with columns work/pe/mp GPCI)
+        """
+        if self._gpci_arrays is None:
+            import numpy as np
+
+            index = {locality: row for row, locality in enumerate(self.gpci_data)}
+            values = np.array(
+                [
+                    (gpci.work_gpci, gpci.pe_gpci, gpci.mp_gpci)
+                    for gpci in self.gpci_data.values()
+                ],
+                dtype=np.float64
+            ).reshape(-1, 3)
+            self._gpci_arrays = (index, values)
+        return self._gpci_arrays
+
     def get_opps(self, hcpcs: str, modifier: Optional[str] = None,
                  carrier: Optional[str] = None, locality: Optional[str] = None) -> Optional[OPPSData]:
         """
@@ -236,19 +479,16 @@ class MedicareFeeSchedule:
         Returns:
             OPPSData if found, None otherwise
         """
-        # Try with all parameters
-        if carrier and locality:
-            key = self._make_opps_key(hcpcs, modifier, carrier, locality)
-            if key in self.opps_data:
-                return self.opps_data[key]
+        if not (carrier and locality):
+            return None
 
-        # Try without modifier
-        if carrier and locality:
-            key = self._make_opps_key(hcpcs, None, carrier, locality)
-            if key in self.opps_data:
-                return self.opps_data[key]
+        opps = self.opps_data.get(self._make_opps_key(hcpcs, modifier, carrier, locality))
 
-        return None
+        # Fall back to the entry without modifier
+        if opps is None and modifier:
+            opps = self.opps_data.get((hcpcs, None, carrier, locality))
+
+        return opps
 
     def get_anesthesia(self, contractor: str, locality: str) -> Optional[AnesthesiaData]:
         """
@@ -264,6 +504,23 @@ class MedicareFeeSchedule:
         key = f"{contractor}:{locality}"
         return self.anesthesia_data.get(key)
 
+    def get_anesthesia_contractor(self, locality: str) -> Optional[str]:
+        """
+        Get the first contractor with anesthesia data for a locality.
+
+        Args:
+            locality: Medicare locality code
+
+        Returns:
+            Contractor code if any anesthesia data covers the locality, None otherwise
+        """
+        if self._anesthesia_contractors is None:
+            contractors: Dict[str, str] = {}
+            for anes in self.anesthesia_data.values():
+                contractors.setdefault(anes.locality, anes.contractor)
+            self._anesthesia_contractors = contractors
+        return self._anesthesia_contractors.get(locality)
+
     def get_anesthesia_base_unit(self, procedure_code: str) -> Optional[AnesthesiaBaseUnitData]:
         """
         Get anesthesia base unit data for a procedure code.
@@ -312,7 +569,12 @@ class MedicareFeeSchedule:
         """
         return self.hospital_data.get(provider_number)
 
-    def load_from_directory(self, directory: Path) -> None:
+    def load_from_directory(
+        self,
+        directory: Path,
+        use_cache: bool = True,
+        cache_dir: Optional[Path] = None
+    ) -> None:
         """
         Load fee schedule data from JSON files in a directory.
 
@@ -321,89 +583,58 @@ class MedicareFeeSchedule:
         - gpci_data.json: GPCI data
         - opps_data.json: OPPS data
         - anesthesia_data.json: Anesthesia conversion factors
+        - anesthesia_base_units.json: Anesthesia base units
+        - ms_drg_data.json: MS-DRG weights
+        - wage_index_data.json: Wage index data
+        - hospital_data.json: Hospital data
+
+        Files are read and parsed on a small thread pool so disk I/O for one
+        file overlaps parsing of another. When cache_dir is given, parsed
+        records are cached there as ``<name>.cache.pkl`` files, so warm starts
+        skip JSON parsing entirely. A cache is only used while the JSON file's
+        path, size and modification time match. Nothing is written to the data
+        directory itself.
 
         Args:
             directory: Path to directory containing data files
+            use_cache: Whether to read and write the pickle caches in cache_dir
+            cache_dir: Directory for the pickle caches (None disables them)
         """
         directory = Path(directory)
-
-        # Load RVU data
-        rvu_file = directory / "rvu_data.json"
-        if rvu_file.exists():
-            with open(rvu_file, 'r') as f:
-                rvu_list = json.load(f)
-                for rvu_dict in rvu_list:
-                    rvu = RVUData(**rvu_dict)
-                    self.add_rvu(rvu)
-
-        # Load GPCI data
-        gpci_file = directory / "gpci_data.json"
-        if gpci_file.exists():
-            with open(gpci_file, 'r') as f:
-                gpci_list = json.load(f)
-                for gpci_dict in gpci_list:
-                    gpci = GPCIData(**gpci_dict)
-                    self.add_gpci(gpci)
-
-        # Load OPPS data
-        opps_file = directory / "opps_data.json"
-        if opps_file.exists():
-            with open(opps_file, 'r') as f:
-                opps_list = json.load(f)
-                for opps_dict in opps_list:
-                    opps = OPPSData(**opps_dict)
-                    self.add_opps(opps)
-
-        # Load Anesthesia data
-        anes_file = directory / "anesthesia_data.json"
-        if anes_file.exists():
-            with open(anes_file, 'r') as f:
-                anes_list = json.load(f)
-                for anes_dict in anes_list:
-                    anes = AnesthesiaData(**anes_dict)
-                    self.add_anesthesia(anes)
-
-        # Load Anesthesia Base Units
-        anes_base_file = directory / "anesthesia_base_units.json"
-        if anes_base_file.exists():
-            with open(anes_base_file, 'r') as f:
-                data = json.load(f)
-                # The file has a "base_units" key containing the actual data
-                if "base_units" in data:
-                    for code, info in data["base_units"].items():
-                        base_unit = AnesthesiaBaseUnitData(
-                            procedure_code=code,
-                            base_units=info["base_units"],
-                            description=info["description"]
-                        )
-                        self.add_anesthesia_base_unit(base_unit)
-
-        # Load MS-DRG data
-        ms_drg_file = directory / "ms_drg_data.json"
-        if ms_drg_file.exists():
-            with open(ms_drg_file, 'r') as f:
-                ms_drg_list = json.load(f)
-                for ms_drg_dict in ms_drg_list:
-                    ms_drg = MSDRGData(**ms_drg_dict)
-                    self.add_ms_drg(ms_drg)
-
-        # Load Wage Index data
-        wage_index_file = directory / "wage_index_data.json"
-        if wage_index_file.exists():
-            with open(wage_index_file, 'r') as f:
-                wage_index_list = json.load(f)
-                for wi_dict in wage_index_list:
-                    wi = WageIndexData(**wi_dict)
-                    self.add_wage_index(wi)
-
-        # Load Hospital data
-        hospital_file = directory / "hospital_data.json"
-        if hospital_file.exists():
-            with open(hospital_file, 'r') as f:
-                hospital_list = json.load(f)
-                for hosp_dict in hospital_list:
-                    hosp = HospitalData(**hosp_dict)
-                    self.add_hospital(hosp)
+        if not use_cache:
+            cache_dir = None
+        elif cache_dir is not None:
+            cache_dir = Path(cache_dir)
+
+        loaders = [
+            ("rvu_data.json", _parse_rvu_file, self.add_rvu),
+            ("gpci_data.json", _parse_gpci_file, self.add_gpci),
+            ("opps_data.json", _parse_opps_file, self.add_opps),
+            ("anesthesia_data.json", _parse_anesthesia_file, self.add_anesthesia),
+            ("anesthesia_base_units.json", _parse_anesthesia_base_units_file, self.add_anesthesia_base_unit),
+            ("ms_drg_data.json", _parse_ms_drg_file, self.add_ms_drg),
+            ("wage_index_data.json", _parse_wage_index_file, self.add_wage_index),
+            ("hospital_data.json", _parse_hospital_file, self.add_hospital),
+        ]
+
+        loaders = [
+            (directory / filename, parse, add)
+            for filename, parse, add in loaders
+            if (directory / filename).exists()
+        ]
+        if not loaders:
+            return
+
+        # Read and parse the files concurrently, then insert the records on
+        # this thread in the order above so later files still win on key clashes
+        with ThreadPoolExecutor(max_workers=min(4, len(loaders))) as executor:
+            pending = [
+                (executor.submit(_load_records, json_file, parse, cache_dir), add)
+                for json_file, parse, add in loaders
+            ]
+            for future, add in pending:
+                for record in future.result():
+                    add(record)
 
     @staticmethod
     def _make_rvu_key(procedure_code: str, modifier: Optional[str]) -> str:
@@ -414,11 +645,141 @@ class MedicareFeeSchedule:
 
     @staticmethod
     def _make_opps_key(hcpcs: str, modifier: Optional[str],
-                       carrier: str, locality: str) -> str:
+                       carrier: str, locality: str) -> Tuple[str, Optional[str], str, str]:
         """Create a unique key for OPPS lookup."""
-        if modifier:
-            return f"{hcpcs}:{modifier}:{carrier}:{locality}"
-        return f"{hcpcs}::{carrier}:{locality}"
+        return (hcpcs, modifier or None, carrier, locality)
+
+
+def _parse_rvu_file(f) -> List[RVUData]:
+    """Parse rvu_data.json."""
+    return [RVUData(**rvu_dict) for rvu_dict in _iter_json_items(f)]
+
+
+def _parse_gpci_file(f) -> List[GPCIData]:
+    """Parse gpci_data.json."""
+    return [GPCIData(**gpci_dict) for gpci_dict in _load_json(f)]
+
+
+def _parse_opps_file(f) -> List[OPPSData]:
+    """Parse opps_data.json."""
+    return [OPPSData(**opps_dict) for opps_dict in _iter_json_items(f)]
+
+
+def _parse_anesthesia_file(f) -> List[AnesthesiaData]:
+    """Parse anesthesia_data.json."""
+    return [AnesthesiaData(**anes_dict) for anes_dict in _load_json(f)]
+
+
+def _parse_anesthesia_base_units_file(f) -> List[AnesthesiaBaseUnitData]:
+    """Parse anesthesia_base_units.json."""
+    data = _load_json(f)
+    # The file has a "base_units" key containing the actual data
+    return [
+        AnesthesiaBaseUnitData(
+            procedure_code=code,
+            base_units=info["base_units"],
+            description=info["description"]
+        )
+        for code, info in data.get("base_units", {}).items()
+    ]
+
+
+def _parse_ms_drg_file(f) -> List[MSDRGData]:
+    """Parse ms_drg_data.json."""
+    return [MSDRGData(**ms_drg_dict) for ms_drg_dict in _load_json(f)]
+
+
+def _parse_wage_index_file(f) -> List[WageIndexData]:
+    """Parse wage_index_data.json."""
+    return [WageIndexData(**wi_dict) for wi_dict in _iter_json_items(f)]
+
+
+def _parse_hospital_file(f) -> List[HospitalData]:
+    """Parse hospital_data.json."""
+    return [HospitalData(**hosp_dict) for hosp_dict in _load_json(f)]
+
+
+def _dump_pickle_atomic(path: Path, obj: Any) -> None:
+    """
+    Pickle an object to a cache file without exposing a partial write.
+
+    The pickle goes to a temporary file in the same directory, which is then
+    moved into place with os.replace, so concurrent readers see either the
+    old file or the complete new one. A location that cannot be written
+    (read-only, full or missing permissions) is silently skipped.
+
+    Args:
+        path: Cache file to write
+        obj: Object to pickle
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    except OSError:
+        return
+
+    replaced = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f, protocol=5)
+        os.replace(tmp_name, path)
+        replaced = True
+    except OSError:
+        # Run without a cache
+        pass
+    finally:
+        if not replaced:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def _load_records(
+    json_file: Path,
+    parse: Callable[[Any], List[Any]],
+    cache_dir: Optional[Path] = None
+) -> List[Any]:
+    """
+    Load the records of a data file, going through its pickle cache.
+
+    The cache stores the source file's path, size and modification time
+    alongside the parsed records and is ignored (and rewritten) when any of
+    them changes. A cache that cannot be read or written is silently skipped.
+
+    Args:
+        json_file: Path to the JSON data file
+        parse: Function turning the open (binary) JSON file into records
+        cache_dir: Directory holding the pickle cache, or None for no cache
+
+    Returns:
+        List of parsed records
+    """
+    if cache_dir is None:
+        with open(json_file, 'rb') as f:
+            return parse(f)
+
+    cache_file = cache_dir / json_file.with_suffix(".cache.pkl").name
+    stat = json_file.stat()
+    signature = (_CACHE_FORMAT_VERSION, str(json_file.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_signature, records = pickle.load(f)
+        if cached_signature == signature:
+            # Unpickling bypasses __post_init__, so re-intern the key fields
+            for record in records:
+                record.__post_init__()
+            return records
+    except Exception:
+        # Missing, stale-format or corrupt cache - fall through and reparse
+        pass
+
+    with open(json_file, 'rb') as f:
+        records = parse(f)
+
+    _dump_pickle_atomic(cache_file, (signature, records))
+    return records
 
 
 def create_default_fee_schedule() -> MedicareFeeSchedule:
@@ -23,13 +23,97 @@ Usage:
 """
 
 import json
+import pickle
 import re
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from .fee_schedule import _dump_pickle_atomic
 from .grouper_models import GrouperInput, GrouperOutput
 from .models import RepricedClaimLine
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Grouping rules file key for each MDC code
+_MDC_KEYS = {
+    "00": "MDC_00_PRE_MDC",
+    "01": "MDC_01_NERVOUS",
+    "04": "MDC_04_RESPIRATORY",
+    "05": "MDC_05_CIRCULATORY",
+    "06": "MDC_06_DIGESTIVE",
+    "08": "MDC_08_MUSCULOSKELETAL",
+    "10": "MDC_10_ENDOCRINE",
+    "11": "MDC_11_KIDNEY_URINARY",
+    "18": "MDC_18_INFECTIOUS_DISEASE"
+}
+
+# Default DRGs by MDC (these are approximate fallbacks)
+_DEFAULT_DRGS = {
+    "01": {"with_mcc": "100", "with_cc": "101", "without_cc_mcc": "102"},
+    "04": {"with_mcc": "189", "with_cc": "190", "without_cc_mcc": "191"},
+    "05": {"with_mcc": "291", "with_cc": "292", "without_cc_mcc": "293"},
+    "06": {"with_mcc": "389", "with_cc": "390", "without_cc_mcc": "391"},
+    "08": {"with_mcc": "548", "with_cc": "549", "without_cc_mcc": "550"},
+    "10": {"with_mcc": "640", "with_cc": "641", "without_cc_mcc": "642"},
+    "11": {"with_mcc": "689", "with_cc": "690", "without_cc_mcc": "691"},
+    "18": {"with_mcc": "871", "without_mcc": "872"}
+}
+
+# Upper bound on memoized code normalizations before the memo is reset
+_NORM_CACHE_LIMIT = 200_000
+
+# Data files read by the grouper
+_DATA_FILES = (
+    "icd10_cm_data.json",
+    "icd10_pcs_data.json",
+    "mdc_definitions.json",
+    "drg_grouping_rules.json",
+    "ms_drg_data.json",
+)
+
+# Bump when the cached grouper state changes shape
+_CACHE_FORMAT_VERSION = 7
+
+# Characters that end the literal prefix of a regex
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+class DxRecord:
+    """Grouping attributes of an ICD-10-CM diagnosis code."""
+
+    __slots__ = ("description", "mdc", "is_cc", "is_mcc")
+
+    def __init__(
+        self,
+        description: Optional[str] = None,
+        mdc: Optional[str] = None,
+        is_cc: bool = False,
+        is_mcc: bool = False
+    ):
+        self.description = description
+        self.mdc = mdc
+        self.is_cc = is_cc
+        self.is_mcc = is_mcc
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DxRecord":
+        """Create a record from an icd10_cm_data.json entry."""
+        return cls(
+            description=data.get("description"),
+            mdc=data.get("mdc"),
+            is_cc=data.get("is_cc", False),
+            is_mcc=data.get("is_mcc", False)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"DxRecord(description={self.description!r}, mdc={self.mdc!r}, "
+            f"is_cc={self.is_cc!r}, is_mcc={self.is_mcc!r})"
+        )
+
 
 class MSDRGGrouper:
     """
@@ -39,24 +123,142 @@ class MSDRGGrouper:
     the appropriate DRG based on clinical and demographic information.
     """
 
-    def __init__(self, data_directory: Path):
+    # Resolved data directory -> (data file signature, built state), shared by
+    # every instance in the process that loads the same data files
+    _shared_data: Dict[Path, Tuple[tuple, Dict]] = {}
+
+    def __init__(
+        self,
+        data_directory: Path,
+        cache_size: int = 65536,
+        use_cache: bool = True,
+        cache_dir: Optional[Path] = None
+    ):
         """
         Initialize the MS-DRG Grouper with data files.
 
         Args:
             data_directory: Path to directory containing grouper data files
+            cache_size: Maximum number of distinct inputs whose grouping
+                        results are memoized (0 disables the cache)
+            use_cache: Whether to reuse data already loaded in this process and
+                       read and write the pickled data cache in cache_dir
+            cache_dir: Directory for the pickled data cache (None disables it)
         """
         self.data_dir = Path(data_directory)
 
-        # Load all data files
-        self.icd10_cm_data = self._load_json("icd10_cm_data.json")
-        self.icd10_pcs_data = self._load_json("icd10_pcs_data.json")
-        self.mdc_definitions = self._load_json("mdc_definitions.json")
-        self.grouping_rules = self._load_json("drg_grouping_rules.json")
-        self.ms_drg_data = self._load_json("ms_drg_data.json")
+        # Memo of raw code -> normalized code (see _norm)
+        self._norm_cache: Dict[str, str] = {}
+
+        # Lookup tables for assign_drg_batch, built on first use
+        self._batch_cache = None
+
+        # Grouping is deterministic, so repeated inputs reuse earlier results.
+        # Memo of grouping key -> GrouperOutput, oldest entries evicted first
+        self._drg_memo: Dict[tuple, GrouperOutput] = {}
+        self._drg_memo_size = cache_size
+        self._drg_memo_lock = threading.Lock()
+
+        # Load all data files and build lookup indexes for performance
+        self._load_data(use_cache, cache_dir)
+
+    @classmethod
+    def warm(cls, data_directory: Path) -> "MSDRGGrouper":
+        """
+        Load and share the grouper data for a directory ahead of time.
+
+        Call this in a pre-forking server before workers are forked, so the
+        workers' groupers reuse the parent's data through copy-on-write pages.
 
-        # Build lookup indexes for performance
-        self._build_indexes()
+        Args:
+            data_directory: Path to directory containing grouper data files
+
+        Returns:
+            A grouper for the directory
+        """
+        return cls(data_directory)
+
+    def _load_data(self, use_cache: bool = True, cache_dir: Optional[Path] = None) -> None:
+        """
+        Load the grouper data files and build the lookup indexes.
+
+        The built state is shared with later instances in this process that
+        use the same data directory and, when cache_dir is given, pickled there
+        for other processes. Both are keyed on the data directory and the size
+        and modification time of every data file, so later instances skip JSON
+        parsing and index construction. A cache that cannot be read or written
+        is silently skipped.
+        """
+        shared_key = self.data_dir.resolve()
+        signature = [_CACHE_FORMAT_VERSION, str(shared_key)]
+        for filename in _DATA_FILES:
+            file_path = self.data_dir / filename
+            if not file_path.exists():
+                raise FileNotFoundError(f"Required data file not found: {file_path}")
+            stat = file_path.stat()
+            signature.append((filename, stat.st_size, stat.st_mtime_ns))
+        signature = tuple(signature)
+        cache_file = None
+        if use_cache and cache_dir is not None:
+            cache_file = Path(cache_dir) / "grouper_data.cache.pkl"
+
+        if use_cache:
+            shared = MSDRGGrouper._shared_data.get(shared_key)
+            if shared is not None and shared[0] == signature:
+                self.__dict__.update(shared[1])
+                return
+
+        runtime_attributes = set(self.__dict__)
+        cache_hit = False
+
+        if cache_file is not None:
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached_signature, state = pickle.load(f)
+                cache_hit = cached_signature == signature
+            except Exception:
+                # Missing, stale-format or corrupt cache - fall through and rebuild
+                pass
+
+        if cache_hit:
+            self.__dict__.update(state)
+            # Unpickled strings are not interned, so re-intern the keys
+            self._intern_lookup_keys()
+        else:
+            self.icd10_cm_data = self._load_json("icd10_cm_data.json")
+            self.icd10_pcs_data = self._load_json("icd10_pcs_data.json")
+            self.mdc_definitions = self._load_json("mdc_definitions.json")
+            self.grouping_rules = self._load_json("drg_grouping_rules.json")
+            self.ms_drg_data = self._load_json("ms_drg_data.json")
+            self._build_indexes()
+            self._intern_lookup_keys()
+
+        if not use_cache:
+            return
+
+        # Everything set above is derived from the data files alone
+        state = {
+            name: value for name, value in self.__dict__.items()
+            if name not in runtime_attributes
+        }
+        MSDRGGrouper._shared_data[shared_key] = (signature, state)
+
+        if cache_file is not None and not cache_hit:
+            _dump_pickle_atomic(cache_file, (signature, state))
+
+    def _intern_lookup_keys(self) -> None:
+        """
+        Intern the code keys of the lookup tables.
+
+        _norm interns the codes it returns, so probes from the grouping path
+        hit these keys by identity instead of comparing string contents.
+        """
+        for name in ("diagnosis_lookup", "procedure_lookup", "drg_lookup"):
+            table = getattr(self, name)
+            setattr(self, name, {sys.intern(code): value for code, value in table.items()})
+        self._mcc_set = frozenset(sys.intern(code) for code in self._mcc_set)
+        self._cc_set = frozenset(sys.intern(code) for code in self._cc_set)
+        self._or_proc_set = frozenset(sys.intern(code) for code in self._or_proc_set)
 
     def _load_json(self, filename: str) -> Dict:
         """Load a JSON data file."""
@@ -82,7 +284,13 @@ class MSDRGGrouper:
             # Ensure codes is a dictionary
             if isinstance(codes, dict):
                 for code, data in codes.items():
-                    self.diagnosis_lookup[code] = data
+                    self.diagnosis_lookup[code] = DxRecord.from_dict(data) if data else None
+
+        # Also key dotted codes by their normalized (dotless) form so lookups
+        # are a single probe; an exact key always wins over a dotless alias
+        for code in list(self.diagnosis_lookup):
+            if len(code) > 4 and code[3] == ".":
+                self.diagnosis_lookup.setdefault(code[:3] + code[4:], self.diagnosis_lookup[code])
 
         # Flatten ICD-10-PCS codes
         self.procedure_lookup = {}
@@ -93,7 +301,23 @@ class MSDRGGrouper:
             # Ensure procedures is a dictionary
             if isinstance(procedures, dict):
                 for code, data in procedures.items():
-                    self.procedure_lookup[code] = data
+                    self.procedure_lookup[self._norm(code)] = data
+
+        # Normalized codes that count as an MCC or (only) a CC when secondary,
+        # so CC/MCC detection is a set membership test per secondary diagnosis
+        self._mcc_set = frozenset(
+            code for code, data in self.diagnosis_lookup.items() if data and data.is_mcc
+        )
+        self._cc_set = frozenset(
+            code for code, data in self.diagnosis_lookup.items()
+            if data and data.is_cc and not data.is_mcc
+        )
+
+        # Normalized codes of OR (operating room) procedures
+        self._or_proc_set = frozenset(
+            code for code, data in self.procedure_lookup.items()
+            if data and data.get("is_or_procedure", False)
+        )
 
         # Index MS-DRG data by DRG code
         self.drg_lookup = {}
@@ -102,11 +326,143 @@ class MSDRGGrouper:
         for drg in drg_list:
             self.drg_lookup[drg["ms_drg"]] = drg
 
+        # Resolve the fallback DRG families to severity tuples once
+        self._default_drgs = {
+            mdc: self._severity_drgs(drgs) for mdc, drgs in _DEFAULT_DRGS.items()
+        }
+        self._ungroupable_drgs = self._severity_drgs({"without_cc_mcc": "999"})
+
+        # MDC code -> that MDC's surgical / medical rule index, so rule lookup
+        # is a single dict probe per claim
+        self._surgical_rules: Dict[str, Dict] = {}
+        self._medical_rules: Dict[str, Dict] = {}
+        mdc_codes = {mdc_key: mdc for mdc, mdc_key in _MDC_KEYS.items()}
+
+        # Precompile rule patterns so matching does not re-parse them per claim,
+        # and index each MDC's rules by the literal prefix of their patterns
+        for mdc_key, mdc_rules in self.grouping_rules.get("grouping_rules", {}).items():
+            if not isinstance(mdc_rules, dict):
+                continue
+            for rule_type in ("surgical_drgs", "medical_drgs"):
+                for rule in mdc_rules.get(rule_type, {}).values():
+                    self._compile_rule_patterns(rule)
+                    rule["_drgs_tuple"] = self._severity_drgs(rule.get("drgs", {}))
+
+            # Only keys that _get_mdc_key can produce are reachable from an MDC code
+            mdc = mdc_codes.get(mdc_key)
+            if mdc is None and mdc_key.startswith("MDC_"):
+                mdc = mdc_key[len("MDC_"):]
+            if mdc is None or self._get_mdc_key(mdc) != mdc_key:
+                continue
+            self._surgical_rules[mdc] = self._build_rule_index(
+                mdc_rules.get("surgical_drgs", {}), self._procedure_rule_prefixes
+            )
+            self._medical_rules[mdc] = self._build_rule_index(
+                mdc_rules.get("medical_drgs", {}), self._diagnosis_rule_prefixes
+            )
+
+    @staticmethod
+    def _glob_to_regex(glob: str) -> str:
+        """Translate a procedure code glob from the rules file to a regex."""
+        return glob.replace("*", ".*").replace(".", "\\.")
+
+    def _compile_rule_patterns(self, rule: Dict) -> None:
+        """
+        Attach compiled regexes to a grouping rule.
+
+        - ``_proc_re``: alternation of all ``procedure_codes`` globs and the
+          ``procedure_pattern`` glob, so each procedure needs one match call
+        - ``_pdx_re``: the ``principal_diagnosis_pattern`` regex
+        """
+        globs = list(rule.get("procedure_codes", []))
+        if "procedure_pattern" in rule:
+            globs.append(rule["procedure_pattern"])
+        if globs:
+            rule["_proc_re"] = re.compile("|".join(
+                f"(?:{self._glob_to_regex(glob)})" for glob in globs
+            ))
+        if "principal_diagnosis_pattern" in rule:
+            rule["_pdx_re"] = re.compile(rule["principal_diagnosis_pattern"])
+
+    @staticmethod
+    def _literal_prefix(pattern: str) -> str:
+        """
+        Return the literal text every match of a regex must start with.
+
+        Stops at the first regex metacharacter; a character made optional by
+        a following quantifier is dropped. Alternations yield no prefix.
+        """
+        if "|" in pattern:
+            return ""
+        prefix = []
+        for char in pattern:
+            if char in _REGEX_METACHARACTERS:
+                if char in "*?{" and prefix:
+                    prefix.pop()
+                break
+            prefix.append(char)
+        return "".join(prefix)
+
+    def _procedure_rule_prefixes(self, rule: Dict) -> List[str]:
+        """Literal prefixes a procedure must start with to match a surgical rule."""
+        globs = list(rule.get("procedure_codes", []))
+        if "procedure_pattern" in rule:
+            globs.append(rule["procedure_pattern"])
+        return [self._literal_prefix(self._glob_to_regex(glob)) for glob in globs]
+
+    def _diagnosis_rule_prefixes(self, rule: Dict) -> List[str]:
+        """Literal prefixes a principal diagnosis must start with to match a medical rule."""
+        prefixes = list(rule.get("specific_diagnoses", []))
+        if "principal_diagnosis_pattern" in rule:
+            prefixes.append(self._literal_prefix(rule["principal_diagnosis_pattern"]))
+        return prefixes
+
+    def _build_rule_index(self, rules: Dict, get_prefixes) -> Dict:
+        """
+        Index an MDC's rules by literal code prefix.
+
+        Rules without a usable literal prefix are stored under the empty
+        prefix, which every lookup probes, so they fall back to a plain
+        regex check.
+        """
+        by_prefix: Dict[str, List[int]] = {}
+        ordered_rules = list(rules.values())
+        for order, rule in enumerate(ordered_rules):
+            for prefix in set(get_prefixes(rule)):
+                by_prefix.setdefault(prefix, []).append(order)
+        return {
+            "rules": ordered_rules,
+            "by_prefix": by_prefix,
+            "max_prefix_len": max(map(len, by_prefix), default=0),
+        }
+
+    @staticmethod
+    def _candidate_rules(index: Dict, codes: List[str]) -> List[Dict]:
+        """
+        Return the rules whose literal prefix matches any of the codes.
+
+        Candidates keep their order from the rules file, so the first one
+        that passes the full pattern check is the same rule a linear scan
+        would have picked.
+        """
+        by_prefix = index["by_prefix"]
+        max_len = index["max_prefix_len"]
+        orders = set()
+        for code in codes:
+            for length in range(min(len(code), max_len), -1, -1):
+                hits = by_prefix.get(code[:length])
+                if hits:
+                    orders.update(hits)
+        rules = index["rules"]
+        return [rules[order] for order in sorted(orders)]
+
     def assign_drg(self, input_data: GrouperInput) -> GrouperOutput:
         """
         Assign an MS-DRG based on clinical and demographic information.
 
-        This is the main entry point for MS-DRG grouping.
+        This is the main entry point for MS-DRG grouping. Results are
+        memoized on the diagnoses, procedures, age and sex, so repeated
+        inputs return the same (frozen) GrouperOutput instance.
 
         Args:
             input_data: GrouperInput with diagnosis codes, procedures, demographics
@@ -114,101 +470,381 @@ class MSDRGGrouper:
         Returns:
             GrouperOutput with assigned MS-DRG and grouping details
         """
-        warnings = []
-        errors = []
+        key = (
+            input_data.principal_diagnosis,
+            tuple(input_data.secondary_diagnoses or ()),
+            # Only the set of procedures affects grouping, not order or repeats
+            tuple(sorted(set(input_data.procedures or ()))),
+            input_data.age,
+            input_data.sex,
+        )
+        memo = self._drg_memo
+        output = memo.get(key)
+        if output is None:
+            output = self._assign_drg_fast(*key)
+            if self._drg_memo_size > 0:
+                with self._drg_memo_lock:
+                    memo[key] = output
+                    if len(memo) > self._drg_memo_size:
+                        del memo[next(iter(memo))]
+        return output
+
+    def assign_drg_code(self, input_data: GrouperInput) -> str:
+        """
+        Assign an MS-DRG and return only its code.
 
-        # Step 1: Validate principal diagnosis
-        pdx = input_data.principal_diagnosis.upper().replace(".", "")
+        Cheaper than assign_drg for callers that just need the DRG, since
+        CC/MCC detection stops as soon as both flags are known and no
+        GrouperOutput is built. Returns "999" for an unknown principal diagnosis.
+
+        Args:
+            input_data: GrouperInput with diagnosis codes, procedures, demographics
+
+        Returns:
+            Assigned MS-DRG code
+        """
+        pdx = self._norm(input_data.principal_diagnosis)
         pdx_data = self._lookup_diagnosis(pdx)
+        if not pdx_data:
+            return "999"
+
+        mdc = pdx_data.mdc
+        if mdc == "00":
+            pre_mdc_result = self._assign_pre_mdc(input_data, pdx_data)
+            if pre_mdc_result:
+                return pre_mdc_result.ms_drg
+
+        _, or_procedures = self._check_or_procedures(input_data.procedures)
+        has_mcc, has_cc = self._determine_cc_mcc_flags(input_data.secondary_diagnoses or [])
+        _, drgs, _ = self._resolve_drg_family(mdc, pdx, tuple(or_procedures))
+        return drgs[0 if has_mcc else 1 if has_cc else 2]
+
+    def clear_cache(self) -> None:
+        """Discard all memoized grouping results."""
+        with self._drg_memo_lock:
+            self._drg_memo.clear()
+
+    def assign_drg_batch(self, claims: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Assign MS-DRGs to a batch of claims.
+
+        Code lookups and CC/MCC and OR procedure detection run as pandas
+        column operations over the whole batch. Rule matching then runs once
+        per distinct (MDC, principal diagnosis, OR procedures) combination,
+        and the severity level is selected per row with NumPy. Results match
+        calling assign_drg on each row.
+
+        Args:
+            claims: DataFrame with a principal_diagnosis column and optional
+                    secondary_diagnoses, procedures (lists of codes), age and
+                    sex columns
+
+        Returns:
+            DataFrame with one column per GrouperOutput field, indexed like claims
+        """
+        import numpy as np
+        import pandas as pd
+
+        dx_frame, or_codes = self._batch_tables()
+        n = len(claims)
+        empty = pd.Series([None] * n, dtype=object)
+
+        def column(name: str) -> pd.Series:
+            if name in claims:
+                return claims[name].reset_index(drop=True)
+            return empty
+
+        raw_pdx = column("principal_diagnosis")
+        pdx = raw_pdx.map(self._norm)
+        pdx_info = dx_frame.reindex(pdx.to_numpy()).reset_index(drop=True)
+        found = pdx.isin(dx_frame.index).to_numpy()
+        mdc = pdx_info["mdc"]
+
+        # CC/MCC detection: one row per secondary diagnosis, then reduce per claim
+        sdx = column("secondary_diagnoses").explode().dropna().map(self._norm)
+        sdx_info = dx_frame.reindex(sdx.to_numpy())
+        sdx_mcc = sdx_info["is_mcc"].fillna(False).astype(bool).to_numpy()
+        sdx_cc = sdx_info["is_cc"].fillna(False).astype(bool).to_numpy() & ~sdx_mcc
+        mcc_codes = sdx[sdx_mcc]
+        cc_codes = sdx[sdx_cc]
+        has_mcc = found & mcc_codes.groupby(level=0).size().reindex(range(n), fill_value=0).to_numpy().astype(bool)
+        has_cc = found & cc_codes.groupby(level=0).size().reindex(range(n), fill_value=0).to_numpy().astype(bool)
+        # Object dtype keeps missing lists as None; pandas would otherwise infer
+        # a string dtype when no claim has any codes and fill with NaN
+        mcc_list = mcc_codes.groupby(level=0).agg(tuple).reindex(range(n)).astype(object)
+        cc_list = cc_codes.groupby(level=0).agg(tuple).reindex(range(n)).astype(object)
+
+        # OR procedures: only the distinct set matters for rule matching
+        procs = column("procedures").explode().dropna().map(self._norm)
+        or_procs = (
+            procs[procs.isin(or_codes)]
+            .groupby(level=0)
+            .agg(lambda codes: tuple(sorted(set(codes))))
+            .reindex(range(n))
+        )
+        or_procs = or_procs.map(lambda codes: codes if isinstance(codes, tuple) else ())
+
+        # Resolve each distinct (MDC, pdx, OR procedures) to a DRG family once
+        families = {}
+        for key in zip(mdc[found], pdx[found], or_procs[found]):
+            if key not in families:
+                families[key] = self._resolve_drg_family(*key)
+        resolved = [families[key] if ok else ("ERROR", (None, None, None), None)
+                    for key, ok in zip(zip(mdc, pdx, or_procs), found)]
+
+        drg_type = np.array([r[0] for r in resolved], dtype=object)
+        tuples = [r[1] for r in resolved]
+        ms_drg = np.select(
+            [has_mcc, has_cc],
+            [np.array([t[0] for t in tuples], dtype=object),
+             np.array([t[1] for t in tuples], dtype=object)],
+            np.array([t[2] for t in tuples], dtype=object),
+        )
+        ms_drg[~found] = "999"
+        warnings = [r[2] for r in resolved]
+
+        drg_details = [self.drg_lookup.get(drg, {}) for drg in ms_drg]
+        mdc_descriptions = {
+            code: self.mdc_definitions["mdcs"].get(code, {}).get("description", f"MDC {code}")
+            for code in mdc[found].unique()
+        }
+
+        result = pd.DataFrame({
+            "ms_drg": ms_drg,
+            "drg_description": [
+                d.get("description", f"MS-DRG {drg}") for d, drg in zip(drg_details, ms_drg)
+            ],
+            "mdc": mdc.where(found, "00"),
+            "mdc_description": mdc.map(mdc_descriptions).where(found, "Ungroupable"),
+            "drg_type": drg_type,
+            "has_mcc": has_mcc,
+            "has_cc": has_cc,
+            "mcc_list": mcc_list.where(found & mcc_list.notna().to_numpy(), None),
+            "cc_list": cc_list.where(found & cc_list.notna().to_numpy(), None),
+            # Object columns so DRGs without a weight or LOS give None, not NaN
+            "relative_weight": pd.Series(
+                [d.get("relative_weight") for d in drg_details], dtype=object
+            ),
+            "geometric_mean_los": pd.Series(
+                [d.get("geometric_mean_los") for d in drg_details], dtype=object
+            ),
+            "arithmetic_mean_los": pd.Series(
+                [d.get("arithmetic_mean_los") for d in drg_details], dtype=object
+            ),
+            "grouping_version": "43.0",
+            "warning_messages": warnings,
+            "error_messages": [
+                None if ok else (f"Principal diagnosis '{code}' not found in grouper database",)
+                for code, ok in zip(raw_pdx, found)
+            ],
+        })
+        result.loc[~found, "drg_description"] = "Ungroupable - Invalid Data"
+
+        # Pre-MDC assignment needs the full input, so defer those rows to assign_drg
+        sdx_column, proc_column = column("secondary_diagnoses"), column("procedures")
+        age, sex = column("age"), column("sex")
+        for row in np.flatnonzero(found & (mdc == "00").to_numpy()):
+            output = self.assign_drg(GrouperInput.model_construct(
+                principal_diagnosis=raw_pdx[row],
+                secondary_diagnoses=sdx_column[row],
+                procedures=proc_column[row],
+                age=age[row],
+                sex=sex[row]
+            ))
+            for field, value in output.model_dump().items():
+                result.at[row, field] = value
+
+        result.index = claims.index
+        return result
+
+    def _batch_tables(self):
+        """
+        Build the lookup tables used by assign_drg_batch on first use.
+
+        Returns:
+            Tuple of (DataFrame of mdc/is_cc/is_mcc indexed by normalized
+            diagnosis code, set of normalized OR procedure codes)
+        """
+        if self._batch_cache is None:
+            import pandas as pd
+
+            rows = {}
+            for code, data in self.diagnosis_lookup.items():
+                if data:
+                    rows[code] = {
+                        "mdc": data.mdc,
+                        "is_cc": bool(data.is_cc),
+                        "is_mcc": bool(data.is_mcc),
+                    }
+            dx_frame = pd.DataFrame.from_dict(
+                rows, orient="index", columns=["mdc", "is_cc", "is_mcc"]
+            )
+            self._batch_cache = (dx_frame, self._or_proc_set)
+        return self._batch_cache
+
+    def _resolve_drg_family(
+        self,
+        mdc: str,
+        pdx: str,
+        or_procedures: Tuple[str, ...]
+    ) -> Tuple[str, Tuple[Optional[str], Optional[str], Optional[str]], Optional[Tuple[str, ...]]]:
+        """
+        Resolve the DRG family for a claim independent of its severity.
+
+        Returns:
+            Tuple of (DRG type, severity tuple as returned by _severity_drgs,
+            warning messages or None)
+        """
+        if or_procedures:
+            rule_data = self._match_surgical_rule(mdc, list(or_procedures))
+            if rule_data is not None:
+                return "SURGICAL", rule_data["_drgs_tuple"], None
+
+        rule_data = self._match_medical_rule(mdc, pdx)
+        if rule_data is not None:
+            return "MEDICAL", rule_data["_drgs_tuple"], None
+
+        return (
+            "MEDICAL",
+            self._default_drgs.get(mdc, self._ungroupable_drgs),
+            (f"No specific DRG rule matched; using default for MDC {mdc}",),
+        )
+
+    def _assign_drg_fast(
+        self,
+        principal_diagnosis: str,
+        secondary_diagnoses: Tuple[str, ...],
+        procedures: Tuple[str, ...],
+        age: int,
+        sex: str
+    ) -> GrouperOutput:
+        """
+        Run the grouping logic for one memoization key.
+
+        This is the per-claim hot path, so the lookup, OR procedure, CC/MCC and
+        rule matching steps are inlined rather than split across helpers.
+        """
+        norm = self._norm
+
+        # Step 1: Validate principal diagnosis
+        pdx = norm(principal_diagnosis)
+        pdx_data = self.diagnosis_lookup.get(pdx)
 
         if not pdx_data:
-            errors.append(f"Principal diagnosis '{input_data.principal_diagnosis}' not found in grouper database")
             # Return a default/error DRG
-            return self._create_error_output(input_data, errors)
+            return self._create_error_output(
+                (f"Principal diagnosis '{principal_diagnosis}' not found in grouper database",)
+            )
 
         # Step 2: Determine MDC from principal diagnosis
-        mdc = pdx_data.get("mdc")
-        mdc_info = self.mdc_definitions["mdcs"].get(mdc, {})
+        mdc = pdx_data.mdc
 
         # Step 3: Check for Pre-MDC assignments (highest priority)
         if mdc == "00":
             # Pre-MDC cases (transplants, tracheostomy, ECMO, etc.)
-            pre_mdc_result = self._assign_pre_mdc(input_data, pdx_data)
+            pre_mdc_result = self._assign_pre_mdc(GrouperInput.model_construct(
+                principal_diagnosis=principal_diagnosis,
+                secondary_diagnoses=list(secondary_diagnoses),
+                procedures=list(procedures),
+                age=age,
+                sex=sex
+            ), pdx_data)
             if pre_mdc_result:
                 return pre_mdc_result
 
         # Step 4: Check for procedures (surgical vs. medical DRG)
-        has_or_procedure, or_procedures = self._check_or_procedures(input_data.procedures)
+        or_proc_set = self._or_proc_set
+        or_procedures = [code for code in map(norm, procedures) if code in or_proc_set]
 
         # Step 5: Determine CC/MCC presence
-        has_mcc, has_cc, mcc_list, cc_list = self._determine_cc_mcc(
-            pdx,
-            input_data.secondary_diagnoses or []
-        )
+        # (In a full implementation, we'd check CC exclusion lists here)
+        mcc_set = self._mcc_set
+        cc_set = self._cc_set
+        mcc_list = []
+        cc_list = []
+        for sdx in secondary_diagnoses:
+            sdx_clean = norm(sdx)
+            if sdx_clean in mcc_set:
+                mcc_list.append(sdx_clean)
+            elif sdx_clean in cc_set:
+                cc_list.append(sdx_clean)
+        severity = 0 if mcc_list else 1 if cc_list else 2
 
         # Step 6: Apply grouping logic based on MDC
         assigned_drg = None
         drg_type = "MEDICAL"
 
-        if has_or_procedure:
+        if or_procedures:
             # Surgical DRG path
             drg_type = "SURGICAL"
-            assigned_drg = self._assign_surgical_drg(
-                mdc, or_procedures, has_mcc, has_cc, pdx, input_data
-            )
+            surgical_index = self._surgical_rules.get(mdc)
+            if surgical_index:
+                for rule_data in self._candidate_rules(surgical_index, or_procedures):
+                    if self._procedure_matches_rule(or_procedures, rule_data):
+                        assigned_drg = rule_data["_drgs_tuple"][severity]
+                        break
 
         if not assigned_drg:
             # Medical DRG path
             drg_type = "MEDICAL"
-            assigned_drg = self._assign_medical_drg(
-                mdc, pdx, has_mcc, has_cc, input_data
-            )
+            medical_index = self._medical_rules.get(mdc)
+            if medical_index:
+                for rule_data in self._candidate_rules(medical_index, [pdx]):
+                    if self._diagnosis_matches_rule(pdx, rule_data):
+                        assigned_drg = rule_data["_drgs_tuple"][severity]
+                        break
 
         # Step 7: If no DRG assigned, use default for MDC
+        warnings = None
         if not assigned_drg:
-            warnings.append(f"No specific DRG rule matched; using default for MDC {mdc}")
-            assigned_drg = self._get_default_drg_for_mdc(mdc, has_mcc, has_cc)
+            warnings = (f"No specific DRG rule matched; using default for MDC {mdc}",)
+            assigned_drg = self._default_drgs.get(mdc, self._ungroupable_drgs)[severity]
 
-        # Step 8: Get DRG details
+        # Step 8: Get DRG and MDC details
         drg_details = self.drg_lookup.get(assigned_drg, {})
+        mdc_info = self.mdc_definitions["mdcs"].get(mdc, {})
 
-        # Step 9: Build output
-        return GrouperOutput(
+        # Step 9: Build output (every value comes from grouper data, so skip validation)
+        return GrouperOutput.model_construct(
             ms_drg=assigned_drg,
             drg_description=drg_details.get("description", f"MS-DRG {assigned_drg}"),
             mdc=mdc,
             mdc_description=mdc_info.get("description", f"MDC {mdc}"),
             drg_type=drg_type,
-            has_mcc=has_mcc,
-            has_cc=has_cc,
-            mcc_list=mcc_list if mcc_list else None,
-            cc_list=cc_list if cc_list else None,
+            has_mcc=bool(mcc_list),
+            has_cc=bool(cc_list),
+            mcc_list=tuple(mcc_list) if mcc_list else None,
+            cc_list=tuple(cc_list) if cc_list else None,
             relative_weight=drg_details.get("relative_weight"),
             geometric_mean_los=drg_details.get("geometric_mean_los"),
             arithmetic_mean_los=drg_details.get("arithmetic_mean_los"),
             grouping_version="43.0",
-            warning_messages=warnings if warnings else None,
-            error_messages=errors if errors else None
+            warning_messages=warnings,
+            error_messages=None
         )
 
-    def _lookup_diagnosis(self, code: str) -> Optional[Dict]:
+    def _norm(self, code: str) -> str:
         """
-        Look up an ICD-10-CM diagnosis code.
+        Normalize an ICD-10 code for lookup: uppercase with decimal points removed.
 
-        Handles codes with or without decimal points.
+        Results are interned and memoized since the same codes recur across claims.
         """
-        # Try exact match first
-        code_clean = code.upper().replace(".", "")
-        if code_clean in self.diagnosis_lookup:
-            return self.diagnosis_lookup[code_clean]
-
-        # Try with decimal point in standard position (after 3rd character)
-        if len(code_clean) > 3:
-            code_with_decimal = code_clean[:3] + "." + code_clean[3:]
-            if code_with_decimal in self.diagnosis_lookup:
-                return self.diagnosis_lookup[code_with_decimal]
+        normalized = self._norm_cache.get(code)
+        if normalized is None:
+            if len(self._norm_cache) >= _NORM_CACHE_LIMIT:
+                self._norm_cache.clear()
+            normalized = sys.intern(code.upper().replace(".", ""))
+            self._norm_cache[code] = normalized
+        return normalized
+
+    def _lookup_diagnosis(self, code: str) -> Optional[DxRecord]:
+        """
+        Look up an ICD-10-CM diagnosis code.
 
-        return None
+        Handles codes with or without decimal points, since diagnosis_lookup
+        holds a dotless alias for every dotted code.
+        """
+        return self.diagnosis_lookup.get(self._norm(code))
 
     def _check_or_procedures(self, procedures: Optional[List[str]]) -> Tuple[bool, List[str]]:
         """
@@ -220,59 +856,37 @@ class MSDRGGrouper:
         if not procedures:
             return False, []
 
-        or_procedures = []
-        for proc in procedures:
-            proc_clean = proc.upper().replace(".", "")
-            proc_data = self.procedure_lookup.get(proc_clean)
-
-            if proc_data and proc_data.get("is_or_procedure", False):
-                or_procedures.append(proc_clean)
-
-        return len(or_procedures) > 0, or_procedures
+        or_proc_set = self._or_proc_set
+        or_procedures = [code for code in map(self._norm, procedures) if code in or_proc_set]
+        return bool(or_procedures), or_procedures
 
-    def _determine_cc_mcc(
-        self,
-        principal_dx: str,
-        secondary_diagnoses: List[str]
-    ) -> Tuple[bool, bool, List[str], List[str]]:
+    def _determine_cc_mcc_flags(self, secondary_diagnoses: List[str]) -> Tuple[bool, bool]:
         """
-        Determine presence of Complications/Comorbidities (CC) and Major CC (MCC).
+        Determine CC/MCC presence without collecting the codes.
 
-        Args:
-            principal_dx: Principal diagnosis code
-            secondary_diagnoses: List of secondary diagnosis codes
+        Stops scanning at the first MCC, since an MCC takes precedence over
+        any CC; has_cc then only reflects the codes scanned so far.
 
         Returns:
-            Tuple of (has_mcc, has_cc, mcc_list, cc_list)
+            Tuple of (has_mcc, has_cc)
         """
-        has_mcc = False
         has_cc = False
-        mcc_list = []
-        cc_list = []
+        mcc_set = self._mcc_set
+        cc_set = self._cc_set
 
         for sdx in secondary_diagnoses:
-            sdx_clean = sdx.upper().replace(".", "")
-            sdx_data = self._lookup_diagnosis(sdx_clean)
-
-            if not sdx_data:
-                continue
-
-            # Check if this diagnosis is excluded as a CC/MCC for this principal diagnosis
-            # (In a full implementation, we'd check CC exclusion lists here)
-
-            if sdx_data.get("is_mcc", False):
-                has_mcc = True
-                mcc_list.append(sdx_clean)
-            elif sdx_data.get("is_cc", False):
+            sdx_clean = self._norm(sdx)
+            if sdx_clean in mcc_set:
+                return True, has_cc
+            if sdx_clean in cc_set:
                 has_cc = True
-                cc_list.append(sdx_clean)
 
-        return has_mcc, has_cc, mcc_list, cc_list
+        return False, has_cc
 
     def _assign_pre_mdc(
         self,
         input_data: GrouperInput,
-        pdx_data: Dict
+        pdx_data: DxRecord
     ) -> Optional[GrouperOutput]:
         """
         Assign Pre-MDC DRGs for special cases like transplants.
@@ -283,86 +897,47 @@ class MSDRGGrouper:
         # (Would be fully implemented with actual Pre-MDC rules)
         return None
 
-    def _assign_surgical_drg(
-        self,
-        mdc: str,
-        or_procedures: List[str],
-        has_mcc: bool,
-        has_cc: bool,
-        pdx: str,
-        input_data: GrouperInput
-    ) -> Optional[str]:
-        """
-        Assign a surgical MS-DRG based on procedures performed.
-
-        This applies MDC-specific surgical grouping rules.
-        """
+    def _match_surgical_rule(self, mdc: str, or_procedures: List[str]) -> Optional[Dict]:
+        """Find the first surgical rule in the MDC matched by any OR procedure."""
         # Get surgical rules for this MDC
-        mdc_key = self._get_mdc_key(mdc)
-        rules = self.grouping_rules.get("grouping_rules", {}).get(mdc_key, {})
-        surgical_rules = rules.get("surgical_drgs", {})
+        surgical_index = self._surgical_rules.get(mdc)
+        if not surgical_index:
+            return None
 
         # Try to match procedures to specific surgical DRG families
-        for rule_name, rule_data in surgical_rules.items():
+        for rule_data in self._candidate_rules(surgical_index, or_procedures):
             if self._procedure_matches_rule(or_procedures, rule_data):
-                # Found a matching rule, now select DRG based on severity
-                drgs = rule_data.get("drgs", {})
-                return self._select_drg_by_severity(drgs, has_mcc, has_cc)
+                return rule_data
 
         return None
 
-    def _assign_medical_drg(
-        self,
-        mdc: str,
-        pdx: str,
-        has_mcc: bool,
-        has_cc: bool,
-        input_data: GrouperInput
-    ) -> Optional[str]:
-        """
-        Assign a medical MS-DRG based on principal diagnosis.
-
-        This applies MDC-specific medical grouping rules.
-        """
+    def _match_medical_rule(self, mdc: str, pdx: str) -> Optional[Dict]:
+        """Find the first medical rule in the MDC matched by the principal diagnosis."""
         # Get medical rules for this MDC
-        mdc_key = self._get_mdc_key(mdc)
-        rules = self.grouping_rules.get("grouping_rules", {}).get(mdc_key, {})
-        medical_rules = rules.get("medical_drgs", {})
+        medical_index = self._medical_rules.get(mdc)
+        if not medical_index:
+            return None
 
         # Try to match principal diagnosis to specific medical DRG families
-        for rule_name, rule_data in medical_rules.items():
+        for rule_data in self._candidate_rules(medical_index, [pdx]):
             if self._diagnosis_matches_rule(pdx, rule_data):
-                # Found a matching rule, now select DRG based on severity
-                drgs = rule_data.get("drgs", {})
-                return self._select_drg_by_severity(drgs, has_mcc, has_cc)
+                return rule_data
 
         return None
 
     def _procedure_matches_rule(self, procedures: List[str], rule: Dict) -> bool:
         """Check if any procedure matches the rule criteria."""
-        # Check for specific procedure codes
-        if "procedure_codes" in rule:
-            for proc_pattern in rule["procedure_codes"]:
-                pattern = proc_pattern.replace("*", ".*").replace(".", "\\.")
-                for proc in procedures:
-                    if re.match(pattern, proc):
-                        return True
-
-        # Check for procedure pattern
-        if "procedure_pattern" in rule:
-            pattern = rule["procedure_pattern"].replace("*", ".*").replace(".", "\\.")
-            for proc in procedures:
-                if re.match(pattern, proc):
-                    return True
-
-        return False
+        # One alternation covers both the specific procedure codes and the pattern
+        proc_re = rule.get("_proc_re")
+        if proc_re is None:
+            return False
+        return any(map(proc_re.match, procedures))
 
     def _diagnosis_matches_rule(self, diagnosis: str, rule: Dict) -> bool:
         """Check if diagnosis matches the rule criteria."""
-        if "principal_diagnosis_pattern" in rule:
-            pattern = rule["principal_diagnosis_pattern"]
-            if re.match(pattern, diagnosis):
-                return True
+        pdx_re = rule.get("_pdx_re")
+        if pdx_re is not None and pdx_re.match(diagnosis):
+            return True
 
         if "specific_diagnoses" in rule:
             if diagnosis in rule["specific_diagnoses"]:
@@ -370,69 +945,31 @@ class MSDRGGrouper:
 
         return False
 
-    def _select_drg_by_severity(self, drgs: Dict, has_mcc: bool, has_cc: bool) -> str:
+    @staticmethod
+    def _severity_drgs(drgs: Dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
-        Select the appropriate DRG from a family based on CC/MCC presence.
+        Resolve a DRG family to the DRG used at each severity level.
 
         Args:
             drgs: Dictionary with keys like 'with_mcc', 'with_cc', 'without_cc_mcc'
-            has_mcc: Whether patient has an MCC
-            has_cc: Whether patient has a CC
 
         Returns:
-            MS-DRG code as a string
-        """
-        if has_mcc and "with_mcc" in drgs:
-            return drgs["with_mcc"]
-        elif (has_cc or has_mcc) and "with_cc" in drgs:
-            return drgs["with_cc"]
-        elif "without_cc_mcc" in drgs:
-            return drgs["without_cc_mcc"]
-        elif "without_mcc" in drgs:
-            return drgs["without_mcc"]
-        else:
-            # Return first available DRG
-            return list(drgs.values())[0]
+            Tuple of (DRG with MCC, DRG with CC only, DRG without CC/MCC)
+        """
+        # Return first available DRG when no severity key applies
+        fallback = next(iter(drgs.values()), None)
+        without = drgs.get("without_cc_mcc", drgs.get("without_mcc", fallback))
+        with_cc = drgs.get("with_cc", without)
+        with_mcc = drgs.get("with_mcc", with_cc)
+        return with_mcc, with_cc, without
 
     def _get_mdc_key(self, mdc: str) -> str:
         """Convert MDC code to lookup key format."""
-        mdc_names = {
-            "00": "MDC_00_PRE_MDC",
-            "01": "MDC_01_NERVOUS",
-            "04": "MDC_04_RESPIRATORY",
-            "05": "MDC_05_CIRCULATORY",
-            "06": "MDC_06_DIGESTIVE",
-            "08": "MDC_08_MUSCULOSKELETAL",
-            "10": "MDC_10_ENDOCRINE",
-            "11": "MDC_11_KIDNEY_URINARY",
-            "18": "MDC_18_INFECTIOUS_DISEASE"
-        }
-        return mdc_names.get(mdc, f"MDC_{mdc}")
-
-    def _get_default_drg_for_mdc(self, mdc: str, has_mcc: bool, has_cc: bool) -> str:
-        """
-        Get a default DRG for an MDC when no specific rule matches.
-
-        This is a fallback to ensure a DRG is always assigned.
-        """
-        # Default DRGs by MDC (these are approximate fallbacks)
-        defaults = {
-            "01": {"with_mcc": "100", "with_cc": "101", "without_cc_mcc": "102"},
-            "04": {"with_mcc": "189", "with_cc": "190", "without_cc_mcc": "191"},
-            "05": {"with_mcc": "291", "with_cc": "292", "without_cc_mcc": "293"},
-            "06": {"with_mcc": "389", "with_cc": "390", "without_cc_mcc": "391"},
-            "08": {"with_mcc": "548", "with_cc": "549", "without_cc_mcc": "550"},
-            "10": {"with_mcc": "640", "with_cc": "641", "without_cc_mcc": "642"},
-            "11": {"with_mcc": "689", "with_cc": "690", "without_cc_mcc": "691"},
-            "18": {"with_mcc": "871", "without_mcc": "872"}
-        }
-
-        mdc_defaults = defaults.get(mdc, {"without_cc_mcc": "999"})
-        return self._select_drg_by_severity(mdc_defaults, has_mcc, has_cc)
+        return _MDC_KEYS.get(mdc) or f"MDC_{mdc}"
 
-    def _create_error_output(self, input_data: GrouperInput, errors: List[str]) -> GrouperOutput:
+    def _create_error_output(self, errors: Tuple[str, ...]) -> GrouperOutput:
         """Create an error output when grouping fails."""
-        return GrouperOutput(
+        return GrouperOutput.model_construct(
             ms_drg="999",
             drg_description="Ungroupable - Invalid Data",
             mdc="00",
@@ -6,8 +6,8 @@ which assigns Medicare Severity Diagnosis Related Groups based on
 ICD-10 diagnosis and procedure codes.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class GrouperInput(BaseModel):
@@ -69,7 +69,12 @@ class GrouperOutput(BaseModel):
 
     This contains the assigned MS-DRG and detailed information
     about how the grouping decision was made.
+
+    Instances are frozen, and their code and message lists are tuples,
+    because the grouper returns the same memoized instance for repeated inputs.
     """
+    model_config = ConfigDict(frozen=True)
+
     # MS-DRG assignment
     ms_drg: str = Field(
         ...,
@@ -105,11 +110,11 @@ class GrouperOutput(BaseModel):
         default=False,
         description="Whether any Complication/Comorbidity (CC) was present (excluding MCCs)"
     )
-    mcc_list: Optional[List[str]] = Field(
+    mcc_list: Optional[Tuple[str, ...]] = Field(
         default=None,
         description="List of ICD-10 codes that qualified as MCCs"
     )
-    cc_list: Optional[List[str]] = Field(
+    cc_list: Optional[Tuple[str, ...]] = Field(
         default=None,
         description="List of ICD-10 codes that qualified as CCs"
     )
@@ -133,11 +138,11 @@ class GrouperOutput(BaseModel):
         default="43.0",
         description="MS-DRG grouper version (e.g., '43.0' for FY 2026)"
     )
-    warning_messages: Optional[List[str]] = Field(
+    warning_messages: Optional[Tuple[str, ...]] = Field(
         default=None,
         description="Warning messages from grouping process"
     )
-    error_messages: Optional[List[str]] = Field(
+    error_messages: Optional[Tuple[str, ...]] = Field(
         default=None,
         description="Error messages from grouping process"
     )
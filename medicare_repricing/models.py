@@ -2,9 +2,15 @@
 Data models for Medicare claims and repricing.
 """
 
-from typing import List, Optional
+import sys
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class ClaimLine(BaseModel):
     """Represents a single line item on a medical claim."""
@@ -61,9 +67,11 @@ class ClaimLine(BaseModel):
     @classmethod
     def validate_procedure_code(cls, v: str) -> str:
         """Validate and normalize procedure code."""
-        if not v or not v.strip():
+        code = v.strip() if v else v
+        if not code:
             raise ValueError("Procedure code cannot be empty")
-        return v.strip().upper()
+        # Interned so repeated codes share one string for fee schedule lookups
+        return sys.intern(code.upper())
 
     @field_validator('place_of_service')
     @classmethod
@@ -72,7 +80,7 @@ class ClaimLine(BaseModel):
         v = v.strip()
         if not v.isdigit() or len(v) != 2:
             raise ValueError("Place of service must be a 2-digit code")
-        return v
+        return sys.intern(v)
 
     @field_validator('modifiers')
     @classmethod
@@ -83,7 +91,14 @@ class ClaimLine(BaseModel):
         if len(v) > 2:
             raise ValueError("Maximum of 2 modifiers allowed")
         # Normalize to uppercase and strip whitespace
-        return [m.strip().upper() for m in v if m and m.strip()]
+        stripped = (m.strip() for m in v if m)
+        return [sys.intern(m.upper()) for m in stripped if m]
+
+    @field_validator('locality')
+    @classmethod
+    def intern_locality(cls, v: Optional[str]) -> Optional[str]:
+        """Intern the locality code, which repeats across most lines."""
+        return sys.intern(v) if v else v
 
 
 class Claim(BaseModel):
@@ -174,3 +189,22 @@ class RepricedClaim(BaseModel):
         if self.notes is None:
             self.notes = []
         self.notes.append(note)
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the repriced claim to JSON bytes.
+
+        Uses orjson directly on the model attributes when it is installed,
+        which is much faster than pydantic serialization for large batches.
+        Falls back to ``model_dump_json`` otherwise.
+        """
+        if orjson is None:
+            return self.model_dump_json().encode()
+        return orjson.dumps(self, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize pydantic models for orjson by their field values."""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
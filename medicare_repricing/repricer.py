@@ -4,13 +4,43 @@ Main Medicare repricing interface.
 Provides the primary interface for repricing claims to Medicare rates.
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+import math
 from pathlib import Path
 
 from .models import Claim, RepricedClaim, RepricedClaimLine
-from .fee_schedule import MedicareFeeSchedule, create_default_fee_schedule
-from .calculator import MedicareCalculator, AnesthesiaCalculator, IPPSCalculator
+from .fee_schedule import MedicareFeeSchedule, RVURow, GPCIRow, create_default_fee_schedule
+from .calculator import MedicareCalculator, AnesthesiaCalculator, IPPSCalculator, FACILITY_POS_CODES
+from .zip_to_locality import get_locality_from_zip
+
+# Claims with at least this many lines rank MPPR procedures with NumPy
+_VECTORIZED_MPPR_MIN_LINES = 16
+
+
+# Repricer used by reprice_claims worker processes, set by _init_worker
+_worker_repricer: Optional["MedicareRepricer"] = None
+
+
+def _init_worker(repricer: "MedicareRepricer") -> None:
+    """Store the repricer a worker process reprices claims with."""
+    global _worker_repricer
+    _worker_repricer = repricer
+
+
+def _reprice_in_worker(claim: Claim, now: str) -> RepricedClaim:
+    """Reprice a claim in a worker process."""
+    return _worker_repricer.reprice_claim(claim, now)
+
+
+def _join_notes(notes: List[str]) -> Optional[str]:
+    """Join calculation notes into an adjustment reason, or None if there are none."""
+    if not notes:
+        return None
+    if len(notes) == 1:
+        return notes[0]
+    return "; ".join(notes)
 
 
 class MedicareRepricer:
@@ -33,7 +63,10 @@ class MedicareRepricer:
     def __init__(
         self,
         fee_schedule: Optional[MedicareFeeSchedule] = None,
-        data_directory: Optional[Path] = None
+        data_directory: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = 256,
+        use_processes: bool = False
     ):
         """
         Initialize the Medicare repricer.
@@ -43,6 +76,13 @@ class MedicareRepricer:
                          uses default sample data.
             data_directory: Optional directory containing fee schedule data files.
                           If provided, loads data from this directory.
+            max_workers: Optional number of threads or processes
+                        reprice_claims may use. Claims are repriced serially
+                        when not provided.
+            parallel_threshold: Minimum number of claims before reprice_claims
+                               uses workers
+            use_processes: Use worker processes instead of threads in
+                          reprice_claims
         """
         if fee_schedule:
             self.fee_schedule = fee_schedule
@@ -57,7 +97,15 @@ class MedicareRepricer:
         self.anesthesia_calculator = AnesthesiaCalculator(self.fee_schedule)
         self.ipps_calculator = IPPSCalculator(self.fee_schedule)
 
-    def reprice_claim(self, claim: Claim) -> RepricedClaim:
+        self._workers = max_workers
+        self._parallel_threshold = parallel_threshold
+        self._use_processes = use_processes
+
+        # Claim note for the conversion factor, rebuilt if the factor changes
+        self._cf_note_factor: Optional[float] = None
+        self._cf_note = ""
+
+    def reprice_claim(self, claim: Claim, now: Optional[str] = None) -> RepricedClaim:
         """
         Reprice a complete claim to Medicare rates.
 
@@ -70,6 +118,8 @@ class MedicareRepricer:
 
         Args:
             claim: Input claim with procedure lines
+            now: Optional ISO timestamp to use as the repricing date
+                (defaults to the current time)
 
         Returns:
             RepricedClaim with Medicare allowed amounts and calculation details
@@ -83,18 +133,30 @@ class MedicareRepricer:
         # Determine if we need to apply MPPR
         # Group procedures by same-day, same-specialty rules
         # For simplicity, we'll apply MPPR to all procedures in order
-        mppr_procedures = self._identify_mppr_procedures(claim.lines)
+        # Lines repeating a code, locality or place of service share lookups
+        rvu_cache: Dict[Tuple[str, Optional[str]], Optional[RVURow]] = {}
+        gpci_cache: Dict[str, Optional[GPCIRow]] = {}
+        mppr_procedures, mppr_count = self._identify_mppr_procedures(claim.lines, rvu_cache)
 
         # Process each line
         repriced_lines: List[RepricedClaimLine] = []
+        amounts: List[float] = []
+
+        # Bind per-line callables once outside the loop
+        get_locality = self._get_locality
+        cached_rvu_row = self._cached_rvu_row
+        cached_gpci_row = self._cached_gpci_row
+        missing_data_error = self.calculator._missing_data_error
+        calculate_unchecked = self.calculator.calculate_allowed_amount_unchecked
+        is_anesthesia_code = self._is_anesthesia_code
 
         for line in claim.lines:
-            try:
-                # Determine locality (from locality field or zip code)
-                locality = self._get_locality(line)
+            # Determine locality (from locality field or zip code)
+            locality = get_locality(line)
 
-                # Check if this is an IPPS (inpatient) claim
-                if line.ms_drg_code and line.provider_number:
+            # Check if this is an IPPS (inpatient) claim
+            if line.ms_drg_code and line.provider_number:
+                try:
                     # Route to IPPS calculator
                     allowed_amount, details = self.ipps_calculator.calculate_allowed_amount(
                         ms_drg=line.ms_drg_code,
@@ -104,7 +166,7 @@ class MedicareRepricer:
                     )
 
                     # Create repriced line for IPPS
-                    repriced_line = RepricedClaimLine(
+                    repriced_line = RepricedClaimLine.model_construct(
                         line_number=line.line_number,
                         procedure_code=line.procedure_code,
                         modifiers=line.modifiers,
@@ -129,103 +191,264 @@ class MedicareRepricer:
                         covered_days=details.get("covered_days"),
                         conversion_factor=0.0,  # Not used for IPPS
                         medicare_allowed=allowed_amount,
-                        adjustment_reason="; ".join(details["notes"]) if details["notes"] else None
+                        adjustment_reason=_join_notes(details["notes"])
                     )
-
-                # Check if this is an anesthesia code
-                elif self._is_anesthesia_code(line.procedure_code):
-                    # Route to anesthesia calculator
-                    contractor = self._get_contractor_from_locality(locality)
-
-                    # Validate required anesthesia fields
-                    if line.anesthesia_time_minutes is None:
-                        raise ValueError(
-                            f"Anesthesia time in minutes is required for anesthesia code {line.procedure_code}"
-                        )
-
-                    # Calculate anesthesia allowed amount
-                    allowed_amount, details = self.anesthesia_calculator.calculate_allowed_amount(
-                        procedure_code=line.procedure_code,
-                        contractor=contractor,
-                        locality=locality,
-                        time_minutes=line.anesthesia_time_minutes,
-                        modifiers=line.modifiers,
-                        physical_status=line.physical_status_modifier,
-                        additional_modifying_units=line.anesthesia_modifying_units or 0
-                    )
-
-                    # Create repriced line for anesthesia
-                    repriced_line = RepricedClaimLine(
-                        line_number=line.line_number,
-                        procedure_code=line.procedure_code,
-                        modifiers=line.modifiers,
-                        place_of_service=line.place_of_service,
-                        locality=locality,
-                        zip_code=line.zip_code,
-                        units=line.units,
-                        service_type="ANESTHESIA",
-                        anesthesia_base_units=details["base_units"],
-                        anesthesia_time_units=details["time_units"],
-                        anesthesia_modifying_units=details["modifying_units"],
-                        anesthesia_total_units=details["total_units"],
-                        conversion_factor=details["conversion_factor"],
-                        medicare_allowed=allowed_amount * line.units,  # Apply units multiplier
-                        adjustment_reason="; ".join(details["notes"]) if details["notes"] else None
+                except ValueError as e:
+                    repriced_line = self._build_error_line(line, locality, "IPPS", str(e))
+
+            # Check if this is an anesthesia code
+            elif is_anesthesia_code(line.procedure_code):
+                # Validate required anesthesia fields up front instead of
+                # raising and catching ValueError
+                if line.anesthesia_time_minutes is None:
+                    repriced_line = self._build_error_line(
+                        line, locality, "ANESTHESIA",
+                        f"Anesthesia time in minutes is required for anesthesia code {line.procedure_code}"
                     )
+                else:
+                    try:
+                        # Route to anesthesia calculator
+                        contractor = self._get_contractor_from_locality(locality)
+
+                        # Calculate anesthesia allowed amount
+                        allowed_amount, details = self.anesthesia_calculator.calculate_allowed_amount(
+                            procedure_code=line.procedure_code,
+                            contractor=contractor,
+                            locality=locality,
+                            time_minutes=line.anesthesia_time_minutes,
+                            modifiers=line.modifiers,
+                            physical_status=line.physical_status_modifier,
+                            additional_modifying_units=line.anesthesia_modifying_units or 0
+                        )
 
+                        # Create repriced line for anesthesia
+                        repriced_line = RepricedClaimLine.model_construct(
+                            line_number=line.line_number,
+                            procedure_code=line.procedure_code,
+                            modifiers=line.modifiers,
+                            place_of_service=line.place_of_service,
+                            locality=locality,
+                            zip_code=line.zip_code,
+                            units=line.units,
+                            service_type="ANESTHESIA",
+                            anesthesia_base_units=details["base_units"],
+                            anesthesia_time_units=float(details["time_units"]),
+                            anesthesia_modifying_units=details["modifying_units"],
+                            anesthesia_total_units=float(details["total_units"]),
+                            conversion_factor=float(details["conversion_factor"]),
+                            medicare_allowed=allowed_amount * line.units,  # Apply units multiplier
+                            adjustment_reason=_join_notes(details["notes"])
+                        )
+                    except ValueError as e:
+                        repriced_line = self._build_error_line(line, locality, "ANESTHESIA", str(e))
+
+            else:
+                # Route to standard PFS calculator, checking for missing fee
+                # schedule data up front instead of catching ValueError
+                rvu_row = cached_rvu_row(line, rvu_cache)
+                gpci_row = cached_gpci_row(locality, gpci_cache)
+                error = missing_data_error(line.procedure_code, locality, rvu_row, gpci_row)
+                if error:
+                    repriced_line = self._build_error_line(line, locality, "PFS", error)
                 else:
-                    # Route to standard PFS calculator
                     # Determine if this is subject to MPPR
-                    is_multiple = len(mppr_procedures) > 1 and line.procedure_code in mppr_procedures
-                    procedure_rank = mppr_procedures.index(line.procedure_code) + 1 if is_multiple else 1
+                    rank = mppr_procedures.get(line.procedure_code)
+                    is_multiple = rank is not None and mppr_count > 1
+                    procedure_rank = rank if is_multiple else 1
 
                     # Calculate Medicare allowed amount
-                    allowed_amount, details = self.calculator.calculate_allowed_amount(
+                    place_of_service = line.place_of_service
+                    allowed_amount, details = calculate_unchecked(
                         procedure_code=line.procedure_code,
-                        place_of_service=line.place_of_service,
+                        place_of_service=place_of_service,
                         locality=locality,
+                        rvu_row=rvu_row,
+                        gpci_row=gpci_row,
                         modifiers=line.modifiers,
                         units=line.units,
                         is_multiple_procedure=is_multiple,
-                        procedure_rank=procedure_rank
+                        procedure_rank=procedure_rank,
+                        is_facility=place_of_service in FACILITY_POS_CODES
                     )
 
                     # Create repriced line
-                    repriced_line = RepricedClaimLine(
+                    repriced_line = RepricedClaimLine.model_construct(
                         line_number=line.line_number,
                         procedure_code=line.procedure_code,
                         modifiers=line.modifiers,
-                        place_of_service=line.place_of_service,
+                        place_of_service=place_of_service,
                         locality=locality,
                         zip_code=line.zip_code,
                         units=line.units,
                         service_type="PFS",
-                        work_rvu=details["work_rvu"],
-                        pe_rvu=details["pe_rvu"],
-                        mp_rvu=details["mp_rvu"],
-                        work_gpci=details["work_gpci"],
-                        pe_gpci=details["pe_gpci"],
-                        mp_gpci=details["mp_gpci"],
-                        conversion_factor=details["conversion_factor"],
+                        work_rvu=details.work_rvu,
+                        pe_rvu=details.pe_rvu,
+                        mp_rvu=details.mp_rvu,
+                        work_gpci=details.work_gpci,
+                        pe_gpci=details.pe_gpci,
+                        mp_gpci=details.mp_gpci,
+                        conversion_factor=float(details.conversion_factor),
                         medicare_allowed=allowed_amount,
-                        adjustment_reason="; ".join(details["notes"]) if details["notes"] else None
+                        adjustment_reason=_join_notes(details.notes)
                     )
 
-                repriced_lines.append(repriced_line)
+            repriced_lines.append(repriced_line)
+            amounts.append(repriced_line.medicare_allowed)
 
-            except ValueError as e:
-                # Create a repriced line with error information
-                locality = self._get_locality(line) if hasattr(line, 'locality') or hasattr(line, 'zip_code') else "00"
+        return self._build_repriced_claim(claim, repriced_lines, amounts, mppr_count, now)
 
-                # Determine service type for error reporting
-                if line.ms_drg_code and line.provider_number:
-                    service_type = "IPPS"
-                elif self._is_anesthesia_code(line.procedure_code):
-                    service_type = "ANESTHESIA"
-                else:
-                    service_type = "PFS"
+    def reprice_claims(self, claims: List[Claim]) -> List[RepricedClaim]:
+        """
+        Reprice multiple claims.
+
+        When the repricer was created with max_workers greater than one and
+        the batch has at least parallel_threshold claims, claims are repriced
+        on a thread pool. The fee schedule is treated as read-only once
+        loaded, so no locking is needed; do not add fee schedule data while a
+        batch is running. Threads only pay off when the pricing work releases
+        the GIL, so profile before enabling them.
+
+        With use_processes, claims are repriced on a process pool instead.
+        The repricer, including its fee schedule, is copied to each worker
+        once when the pool starts, and claims are sent in chunks, so this
+        suits large batches.
+
+        Args:
+            claims: List of claims to reprice
+
+        Returns:
+            List of repriced claims, in input order
+        """
+        # Stamp the whole batch once instead of per claim
+        now = datetime.now().isoformat()
+        if self._workers and self._workers > 1 and len(claims) >= self._parallel_threshold:
+            if self._use_processes:
+                chunksize = max(1, len(claims) // (self._workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=self._workers, initializer=_init_worker, initargs=(self,)
+                ) as executor:
+                    return list(executor.map(
+                        _reprice_in_worker, claims, [now] * len(claims), chunksize=chunksize
+                    ))
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                return list(executor.map(self.reprice_claim, claims, [now] * len(claims)))
+        return [self.reprice_claim(claim, now) for claim in claims]
+
+    def reprice_claims_bulk(self, claims: List[Claim]) -> List[RepricedClaim]:
+        """
+        Reprice multiple claims with vectorized PFS arithmetic.
+
+        Claims made up entirely of priceable PFS lines have their RVU, GPCI
+        and MPPR arithmetic computed for the whole batch at once with NumPy.
+        Claims with IPPS, anesthesia or unpriceable lines are repriced with
+        reprice_claim. Results match reprice_claims.
 
-                repriced_line = RepricedClaimLine(
+        Args:
+            claims: List of claims to reprice
+
+        Returns:
+            List of repriced claims, in input order
+
+        Raises:
+            ValueError: If claim validation fails
+        """
+        import numpy as np
+        from ._kernels import pfs_allowed_amounts
+
+        rvu_index, rvu_values, _ = self.fee_schedule.rvu_arrays()
+        gpci_index, gpci_values = self.fee_schedule.gpci_arrays()
+        default_gpci_row = gpci_index.get("00")
+        now = datetime.now().isoformat()
+        modifier_effects: Dict[str, Tuple[Tuple[float, float, float], List[str]]] = {}
+
+        results: List[Optional[RepricedClaim]] = [None] * len(claims)
+        bulk_claims = []
+        bulk_lines = []
+        rvu_rows: List[int] = []
+        rvu_columns: List[int] = []
+        gpci_rows: List[int] = []
+        modifier_factors: List[List[Tuple[float, float, float]]] = []
+        mppr_factors: List[float] = []
+        units: List[int] = []
+
+        for claim_index, claim in enumerate(claims):
+            self._validate_claim(claim)
+
+            rvu_cache: Dict[Tuple[str, Optional[str]], Optional[RVURow]] = {}
+            mppr_procedures, mppr_count = self._identify_mppr_procedures(claim.lines, rvu_cache)
+
+            planned = []
+            for line in claim.lines:
+                if (line.ms_drg_code and line.provider_number) or self._is_anesthesia_code(line.procedure_code):
+                    break
+                try:
+                    locality = self._get_locality(line)
+                except ValueError:
+                    break
+                rvu_row = self._cached_rvu_row(line, rvu_cache)
+                if not rvu_row:
+                    break
+                gpci_row = gpci_index.get(locality, default_gpci_row)
+                if gpci_row is None:
+                    break
+
+                rank = mppr_procedures.get(line.procedure_code)
+                is_multiple = rank is not None and mppr_count > 1
+                notes = []
+                factors = []
+                for modifier in line.modifiers or ():
+                    if modifier not in modifier_effects:
+                        work, pe, mp, modifier_notes = self.calculator._apply_modifier_adjustments(
+                            1.0, 1.0, 1.0, [modifier]
+                        )
+                        modifier_effects[modifier] = ((work, pe, mp), modifier_notes)
+                    factor, modifier_notes = modifier_effects[modifier]
+                    factors.append(factor)
+                    notes.extend(modifier_notes)
+                if is_multiple and rank > 1 and rvu_row[6] == 2:
+                    mppr_factor = 0.50
+                    notes.append(f"MPPR 50% applied (procedure rank {rank})")
+                else:
+                    mppr_factor = 1.0
+
+                is_facility = line.place_of_service in FACILITY_POS_CODES
+                planned.append((
+                    line, locality, notes,
+                    self._rvu_array_row(rvu_index, line),
+                    3 if is_facility else 0, gpci_row, factors, mppr_factor
+                ))
+            else:
+                bulk_claims.append((claim_index, claim, len(planned), mppr_count))
+                for line, locality, notes, rvu_row, column, gpci_row, factors, mppr_factor in planned:
+                    bulk_lines.append((line, locality, notes))
+                    rvu_rows.append(rvu_row)
+                    rvu_columns.append(column)
+                    gpci_rows.append(gpci_row)
+                    modifier_factors.append(factors)
+                    mppr_factors.append(mppr_factor)
+                    units.append(line.units)
+                continue
+
+            results[claim_index] = self.reprice_claim(claim, now)
+
+        if bulk_lines:
+            columns = np.asarray(rvu_columns)[:, None] + np.arange(3)
+            rvus = rvu_values[np.asarray(rvu_rows)[:, None], columns]
+            for position in range(max(len(factors) for factors in modifier_factors)):
+                rvus = rvus * np.array([
+                    factors[position] if position < len(factors) else (1.0, 1.0, 1.0)
+                    for factors in modifier_factors
+                ])
+            gpcis = gpci_values[np.asarray(gpci_rows)]
+            _, allowed = pfs_allowed_amounts(
+                rvus, gpcis, self.fee_schedule.conversion_factor,
+                np.asarray(mppr_factors, dtype=np.float64), np.asarray(units, dtype=np.float64)
+            )
+
+            allowed_amounts = allowed.tolist()
+            conversion_factor = float(self.fee_schedule.conversion_factor)
+            repriced_lines = [
+                RepricedClaimLine.model_construct(
                     line_number=line.line_number,
                     procedure_code=line.procedure_code,
                     modifiers=line.modifiers,
@@ -233,49 +456,76 @@ class MedicareRepricer:
                     locality=locality,
                     zip_code=line.zip_code,
                     units=line.units,
-                    service_type=service_type,
-                    work_rvu=0.0 if service_type == "PFS" else None,
-                    pe_rvu=0.0 if service_type == "PFS" else None,
-                    mp_rvu=0.0 if service_type == "PFS" else None,
-                    work_gpci=0.0 if service_type == "PFS" else None,
-                    pe_gpci=0.0 if service_type == "PFS" else None,
-                    mp_gpci=0.0 if service_type == "PFS" else None,
-                    conversion_factor=self.fee_schedule.conversion_factor if service_type != "IPPS" else 0.0,
-                    medicare_allowed=0.0,
-                    adjustment_reason=f"ERROR: {str(e)}"
+                    service_type="PFS",
+                    work_rvu=work_rvu,
+                    pe_rvu=pe_rvu,
+                    mp_rvu=mp_rvu,
+                    work_gpci=work_gpci,
+                    pe_gpci=pe_gpci,
+                    mp_gpci=mp_gpci,
+                    conversion_factor=conversion_factor,
+                    medicare_allowed=medicare_allowed,
+                    adjustment_reason=_join_notes(notes)
                 )
-                repriced_lines.append(repriced_line)
+                for (line, locality, notes), (work_rvu, pe_rvu, mp_rvu), (work_gpci, pe_gpci, mp_gpci), medicare_allowed
+                in zip(bulk_lines, rvus.tolist(), gpcis.tolist(), allowed_amounts)
+            ]
+
+            start = 0
+            for claim_index, claim, line_count, mppr_count in bulk_claims:
+                end = start + line_count
+                results[claim_index] = self._build_repriced_claim(
+                    claim, repriced_lines[start:end], allowed_amounts[start:end], mppr_count, now
+                )
+                start += line_count
+
+        return results
+
+    def _build_repriced_claim(
+        self,
+        claim: Claim,
+        repriced_lines: List[RepricedClaimLine],
+        amounts: List[float],
+        mppr_count: int,
+        now: Optional[str] = None
+    ) -> RepricedClaim:
+        """
+        Total repriced lines into a repriced claim with informational notes.
 
-        # Calculate totals
-        total_allowed = sum(line.medicare_allowed for line in repriced_lines)
+        Args:
+            claim: Claim the lines were repriced from
+            repriced_lines: Repriced lines in claim order
+            amounts: Medicare allowed amount of each repriced line
+            mppr_count: Number of lines subject to MPPR
+            now: ISO timestamp for the repricing date, or None for the current time
 
-        # Create repriced claim
-        repriced_claim = RepricedClaim(
+        Returns:
+            RepricedClaim for the claim
+        """
+        # Calculate totals with compensated summation
+        total_allowed = math.fsum(amounts)
+
+        # Create repriced claim. Output models are built from values the
+        # calculators already produced, so validation is skipped.
+        repriced_claim = RepricedClaim.model_construct(
             claim_id=claim.claim_id,
             lines=repriced_lines,
             total_allowed=total_allowed,
-            repricing_date=datetime.now().isoformat()
+            repricing_date=now if now is not None else datetime.now().isoformat(),
+            notes=[]
         )
 
         # Add informational notes
-        repriced_claim.add_note(f"Repriced using Medicare Conversion Factor: ${self.fee_schedule.conversion_factor}")
-        if len(mppr_procedures) > 1:
-            repriced_claim.add_note(f"MPPR applied to {len(mppr_procedures)} procedures")
+        conversion_factor = self.fee_schedule.conversion_factor
+        if conversion_factor != self._cf_note_factor:
+            self._cf_note = f"Repriced using Medicare Conversion Factor: ${conversion_factor}"
+            self._cf_note_factor = conversion_factor
+        repriced_claim.add_note(self._cf_note)
+        if mppr_count > 1:
+            repriced_claim.add_note(f"MPPR applied to {mppr_count} procedures")
 
         return repriced_claim
 
-    def reprice_claims(self, claims: List[Claim]) -> List[RepricedClaim]:
-        """
-        Reprice multiple claims.
-
-        Args:
-            claims: List of claims to reprice
-
-        Returns:
-            List of repriced claims
-        """
-        return [self.reprice_claim(claim) for claim in claims]
-
     def _validate_claim(self, claim: Claim) -> None:
         """
         Validate claim structure and data.
@@ -289,15 +539,17 @@ class MedicareRepricer:
         if not claim.claim_id or not claim.claim_id.strip():
             raise ValueError("Claim ID is required")
 
-        if not claim.lines:
+        lines = claim.lines
+        if not lines:
             raise ValueError("At least one claim line is required")
 
-        # Validate line numbers are sequential and unique
-        line_numbers = [line.line_number for line in claim.lines]
-        if len(line_numbers) != len(set(line_numbers)):
+        # Validate line numbers are sequential and unique; a single line
+        # cannot clash
+        if len(lines) > 1 and len({line.line_number for line in lines}) != len(lines):
             raise ValueError("Claim line numbers must be unique")
 
-    def _is_anesthesia_code(self, procedure_code: str) -> bool:
+    @staticmethod
+    def _is_anesthesia_code(procedure_code: str) -> bool:
         """
         Determine if a procedure code is an anesthesia code.
 
@@ -309,8 +561,8 @@ class MedicareRepricer:
         Returns:
             True if anesthesia code, False otherwise
         """
-        # Anesthesia codes start with 00 or 01
-        return procedure_code.startswith(('00', '01')) and len(procedure_code) == 5
+        # Anesthesia codes are 5 characters starting with 00 or 01
+        return len(procedure_code) == 5 and procedure_code[0] == '0' and procedure_code[1] in '01'
 
     def _get_contractor_from_locality(self, locality: str) -> str:
         """
@@ -325,11 +577,10 @@ class MedicareRepricer:
         Returns:
             Contractor code
         """
-        # For now, we'll search through the anesthesia data to find a matching locality
-        # and return the first contractor that has data for this locality
-        for key, anes_data in self.fee_schedule.anesthesia_data.items():
-            if anes_data.locality == locality:
-                return anes_data.contractor
+        # Use the first contractor that has anesthesia data for this locality
+        contractor = self.fee_schedule.get_anesthesia_contractor(locality)
+        if contractor is not None:
+            return contractor
 
         # Default to a common contractor if not found
         return "01112"  # California contractor as default
@@ -354,7 +605,6 @@ class MedicareRepricer:
             return line.locality
         elif line.zip_code:
             # Use zip code to locality mapping
-            from .zip_to_locality import get_locality_from_zip
             locality = get_locality_from_zip(line.zip_code)
             if not locality:
                 raise ValueError(f"Unable to map zip code {line.zip_code} to locality")
@@ -362,7 +612,86 @@ class MedicareRepricer:
         else:
             raise ValueError("Either locality or zip_code must be provided")
 
-    def _identify_mppr_procedures(self, lines: List) -> List[str]:
+    def _build_error_line(
+        self,
+        line,
+        locality: str,
+        service_type: str,
+        error: str
+    ) -> RepricedClaimLine:
+        """
+        Build a zero-allowed repriced line for a line that could not be priced.
+
+        Args:
+            line: Claim line that failed
+            locality: Resolved locality code for the line
+            service_type: PFS, ANESTHESIA or IPPS
+            error: Error message
+
+        Returns:
+            RepricedClaimLine carrying the error in adjustment_reason
+        """
+        is_pfs = service_type == "PFS"
+        return RepricedClaimLine.model_construct(
+            line_number=line.line_number,
+            procedure_code=line.procedure_code,
+            modifiers=line.modifiers,
+            place_of_service=line.place_of_service,
+            locality=locality,
+            zip_code=line.zip_code,
+            units=line.units,
+            service_type=service_type,
+            work_rvu=0.0 if is_pfs else None,
+            pe_rvu=0.0 if is_pfs else None,
+            mp_rvu=0.0 if is_pfs else None,
+            work_gpci=0.0 if is_pfs else None,
+            pe_gpci=0.0 if is_pfs else None,
+            mp_gpci=0.0 if is_pfs else None,
+            conversion_factor=float(self.fee_schedule.conversion_factor) if service_type != "IPPS" else 0.0,
+            medicare_allowed=0.0,
+            adjustment_reason=f"ERROR: {error}"
+        )
+
+    def _cached_gpci_row(
+        self,
+        locality: str,
+        gpci_cache: Dict[str, Optional[GPCIRow]]
+    ) -> Optional[GPCIRow]:
+        """Look up a GPCI row, with national fallback, through a per-claim cache."""
+        if locality in gpci_cache:
+            return gpci_cache[locality]
+        gpci_row = gpci_cache[locality] = self.calculator._resolve_gpci_row(locality)
+        return gpci_row
+
+    def _cached_rvu_row(
+        self,
+        line,
+        rvu_cache: Dict[Tuple[str, Optional[str]], Optional[RVURow]]
+    ) -> Optional[RVURow]:
+        """Look up the RVU row for a line through a per-claim cache."""
+        # Use first modifier for RVU lookup if available
+        first_modifier = line.modifiers[0] if line.modifiers and len(line.modifiers) > 0 else None
+        key = (line.procedure_code, first_modifier)
+        if key in rvu_cache:
+            return rvu_cache[key]
+        rvu_row = rvu_cache[key] = self.fee_schedule.get_rvu_row(line.procedure_code, first_modifier)
+        return rvu_row
+
+    def _rvu_array_row(self, rvu_index: Dict[str, int], line) -> Optional[int]:
+        """Find a line's row in the fee schedule RVU array, as get_rvu would."""
+        make_rvu_key = self.fee_schedule._make_rvu_key
+        first_modifier = line.modifiers[0] if line.modifiers and len(line.modifiers) > 0 else None
+        if first_modifier:
+            row = rvu_index.get(make_rvu_key(line.procedure_code, first_modifier))
+            if row is not None:
+                return row
+        return rvu_index.get(make_rvu_key(line.procedure_code, None))
+
+    def _identify_mppr_procedures(
+        self,
+        lines: List,
+        rvu_cache: Optional[Dict[Tuple[str, Optional[str]], Optional[RVURow]]] = None
+    ) -> Tuple[Dict[str, int], int]:
         """
         Identify procedures subject to Multiple Procedure Payment Reduction.
 
@@ -378,30 +707,89 @@ class MedicareRepricer:
 
         Args:
             lines: List of claim lines
+            rvu_cache: Optional per-claim RVU cache to read and populate
 
         Returns:
-            List of procedure codes in MPPR order (highest to lowest)
+            Tuple of (dictionary mapping procedure code to its MPPR rank,
+            1 being the highest RVU, and the number of lines subject to MPPR)
         """
+        if len(lines) >= _VECTORIZED_MPPR_MIN_LINES:
+            return self._identify_mppr_procedures_vectorized(lines)
+
+        if rvu_cache is None:
+            rvu_cache = {}
+
+        # Resolve the RVU rows of every distinct (code, first modifier) in one call
+        keys = [(line.procedure_code, line.modifiers[0] if line.modifiers else None) for line in lines]
+        missing = [key for key in dict.fromkeys(keys) if key not in rvu_cache]
+        if missing:
+            rvu_cache.update(zip(missing, self.fee_schedule.get_rvu_rows(missing)))
+
         # Get unique procedure codes
-        procedures = []
-        for line in lines:
-            # Use first modifier for RVU lookup if available
-            first_modifier = line.modifiers[0] if line.modifiers and len(line.modifiers) > 0 else None
-            rvu = self.fee_schedule.get_rvu(line.procedure_code, first_modifier)
-            if rvu and rvu.mp_indicator == 2:  # Subject to MPPR
+        codes: List[str] = []
+        total_rvus: List[float] = []
+        for line, key in zip(lines, keys):
+            rvu_row = rvu_cache[key]
+            if rvu_row and rvu_row[6] == 2:  # Subject to MPPR
                 # Calculate total RVU for ranking
-                is_facility = self.calculator._is_facility_setting(line.place_of_service)
-                total_rvu = (
-                    (rvu.work_rvu_f if is_facility else rvu.work_rvu_nf) +
-                    (rvu.pe_rvu_f if is_facility else rvu.pe_rvu_nf) +
-                    (rvu.mp_rvu_f if is_facility else rvu.mp_rvu_nf)
-                )
-                procedures.append((line.procedure_code, total_rvu))
+                offset = 1 if line.place_of_service in FACILITY_POS_CODES else 0
+                total_rvu = rvu_row[offset] + rvu_row[2 + offset] + rvu_row[4 + offset]
+                codes.append(line.procedure_code)
+                total_rvus.append(total_rvu)
 
-        # Sort by total RVU (descending)
-        procedures.sort(key=lambda x: x[1], reverse=True)
+        # Sort by total RVU (descending), keeping billed order for ties
+        order = sorted(range(len(codes)), key=total_rvus.__getitem__, reverse=True)
+        return self._rank_mppr_codes(codes, order)
+
+    def _identify_mppr_procedures_vectorized(self, lines: List) -> Tuple[Dict[str, int], int]:
+        """
+        Identify MPPR procedures for a large claim using the fee schedule arrays.
+
+        Total RVUs are summed and ranked with NumPy instead of per line,
+        giving the same result as _identify_mppr_procedures.
+
+        Args:
+            lines: List of claim lines
+
+        Returns:
+            Tuple of (dictionary mapping procedure code to its MPPR rank,
+            1 being the highest RVU, and the number of lines subject to MPPR)
+        """
+        import numpy as np
+
+        rvu_index, rvu_values, mp_indicators = self.fee_schedule.rvu_arrays()
+
+        codes: List[str] = []
+        rows: List[int] = []
+        facility_flags: List[bool] = []
+        for line in lines:
+            row = self._rvu_array_row(rvu_index, line)
+            if row is not None:
+                codes.append(line.procedure_code)
+                rows.append(row)
+                facility_flags.append(line.place_of_service in FACILITY_POS_CODES)
+
+        rows_array = np.asarray(rows, dtype=np.intp)
+        subject = np.flatnonzero(mp_indicators[rows_array] == 2)
+        values = rvu_values[rows_array[subject]]
+        total_rvus = np.where(
+            np.asarray(facility_flags, dtype=bool)[subject],
+            values[:, 3] + values[:, 4] + values[:, 5],
+            values[:, 0] + values[:, 1] + values[:, 2]
+        )
 
-        return [code for code, _ in procedures]
+        # Sort by total RVU (descending), keeping billed order for ties
+        order = np.argsort(-total_rvus, kind="stable").tolist()
+        return self._rank_mppr_codes([codes[index] for index in subject.tolist()], order)
+
+    @staticmethod
+    def _rank_mppr_codes(codes: List[str], order: List[int]) -> Tuple[Dict[str, int], int]:
+        """Assign MPPR ranks to codes visited in descending total RVU order."""
+        # A code billed on several lines keeps the rank of its first occurrence
+        ranks: Dict[str, int] = {}
+        for rank, index in enumerate(order, start=1):
+            ranks.setdefault(codes[index], rank)
+        return ranks, len(codes)
 
     def get_procedure_info(self, procedure_code: str, modifiers: Optional[List[str]] = None) -> Optional[dict]:
         """
@@ -5,7 +5,42 @@ This module provides mapping from US zip codes to Medicare locality codes
 for Geographic Practice Cost Index (GPCI) lookup.
 """
 
-from typing import Optional, Dict
+import functools
+from typing import Optional, Dict, List
+
+
+def _marks_stale(method):
+    """Wrap a dict mutator so the locality table is rebuilt before the next lookup."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.stale = True
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _ZipPrefixMap(dict):
+    """
+    Zip prefix to locality dict that tracks edits to itself.
+
+    Any mutation sets ``stale`` so get_locality_from_zip rebuilds the flat
+    locality table first, keeping this mapping the source of truth.
+    """
+
+    __slots__ = ("stale",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stale = True
+
+    __setitem__ = _marks_stale(dict.__setitem__)
+    __delitem__ = _marks_stale(dict.__delitem__)
+    __ior__ = _marks_stale(dict.__ior__)
+    clear = _marks_stale(dict.clear)
+    pop = _marks_stale(dict.pop)
+    popitem = _marks_stale(dict.popitem)
+    setdefault = _marks_stale(dict.setdefault)
+    update = _marks_stale(dict.update)
+
 
 # Zip code to locality mapping
 # This is a sample mapping - in production, this would be a comprehensive database
@@ -22,7 +57,7 @@ from typing import Optional, Dict
 
 # Sample mapping for demonstration
 # Format: zip_code_prefix -> locality_code
-ZIP_TO_LOCALITY: Dict[str, str] = {
+ZIP_TO_LOCALITY: Dict[str, str] = _ZipPrefixMap({
     # New York
     "100": "01",  # Manhattan
     "101": "01",
@@ -126,7 +161,33 @@ ZIP_TO_LOCALITY: Dict[str, str] = {
     "025": "24",
     "026": "24",
     "027": "24",
-}
+})
+
+# Number of possible 5-digit zip codes
+_ZIP_SPACE = 100000
+
+# Resolved locality for every 5-digit zip code, indexed by int(zip_code)
+_LOCALITY_TABLE: List[str] = []
+
+
+def _rebuild_locality_table() -> None:
+    """
+    Rebuild the flat zip code to locality table from ZIP_TO_LOCALITY.
+
+    2-digit prefixes are applied first and then overwritten by 3-digit
+    prefixes, matching the lookup precedence of the prefix mapping.
+    Prefixes of any other length are ignored, as before.
+    """
+    # Clear the flag first so an edit made during the rebuild is not lost
+    ZIP_TO_LOCALITY.stale = False
+    table = ["00"] * _ZIP_SPACE
+    for prefix_length in (2, 3):
+        span = 10 ** (5 - prefix_length)
+        for prefix, locality in ZIP_TO_LOCALITY.items():
+            if len(prefix) == prefix_length and prefix.isascii() and prefix.isdigit():
+                start = int(prefix) * span
+                table[start:start + span] = [locality] * span
+    _LOCALITY_TABLE[:] = table
 
 
 def get_locality_from_zip(zip_code: str) -> Optional[str]:
@@ -160,19 +221,13 @@ def get_locality_from_zip(zip_code: str) -> Optional[str]:
     if not zip_code.isdigit() or len(zip_code) != 5:
         return None
 
-    # Try matching with 3-digit prefix (most common)
-    prefix_3 = zip_code[:3]
-    if prefix_3 in ZIP_TO_LOCALITY:
-        return ZIP_TO_LOCALITY[prefix_3]
-
-    # Try matching with 2-digit prefix (for broader regions)
-    prefix_2 = zip_code[:2]
-    if prefix_2 in ZIP_TO_LOCALITY:
-        return ZIP_TO_LOCALITY[prefix_2]
-
-    # Return national average if no specific mapping found
-    # In production, you might want to raise an error instead
-    return "00"
+    # Zip codes without a specific mapping resolve to the national average
+    # "00". In production, you might want to raise an error instead
+    if not zip_code.isascii():
+        return "00"
+    if ZIP_TO_LOCALITY.stale:
+        _rebuild_locality_table()
+    return _LOCALITY_TABLE[int(zip_code)]
 
 
 def add_zip_mapping(zip_prefix: str, locality: str) -> None:
@@ -222,3 +277,6 @@ def get_all_localities() -> set:
         Set of all unique locality codes
     """
     return set(ZIP_TO_LOCALITY.values())
+
+
+_rebuild_locality_table()
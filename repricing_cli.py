@@ -7,11 +7,15 @@ Quick tool for repricing individual procedures or claims.
 
 import argparse
 import sys
-from medicare_repricing import MedicareRepricer, Claim, ClaimLine
+
+# medicare_repricing (and pydantic) is imported inside each command so that
+# --help and argument errors return without loading it.
 
 
 def reprice_procedure(args):
     """Reprice a single procedure."""
+    from medicare_repricing import MedicareRepricer, Claim, ClaimLine
+
     repricer = MedicareRepricer()
 
     # Create a simple claim with one line
@@ -23,7 +27,7 @@ def reprice_procedure(args):
             ClaimLine(
                 line_number=1,
                 procedure_code=args.procedure,
-                modifier=args.modifier,
+                modifiers=[args.modifier] if args.modifier else None,
                 place_of_service=args.pos,
                 locality=args.locality,
                 units=args.units
@@ -33,79 +37,97 @@ def reprice_procedure(args):
 
     try:
         repriced = repricer.reprice_claim(claim)
-        line = repriced.lines[0]
-
-        print("\n" + "=" * 60)
-        print("MEDICARE REPRICING RESULT")
-        print("=" * 60)
-        print(f"Procedure Code:  {line.procedure_code}")
-        if line.modifier:
-            print(f"Modifier:        {line.modifier}")
-        print(f"Place of Service: {line.place_of_service}")
-        print(f"Locality:        {line.locality}")
-        print(f"Units:           {line.units}")
-        print()
-        print("RVU Values:")
-        print(f"  Work RVU:  {line.work_rvu:.4f}")
-        print(f"  PE RVU:    {line.pe_rvu:.4f}")
-        print(f"  MP RVU:    {line.mp_rvu:.4f}")
-        print()
-        print("GPCI Values:")
-        print(f"  Work GPCI: {line.work_gpci:.4f}")
-        print(f"  PE GPCI:   {line.pe_gpci:.4f}")
-        print(f"  MP GPCI:   {line.mp_gpci:.4f}")
-        print()
-        print(f"Conversion Factor: ${line.conversion_factor:.4f}")
-        print()
-        print(f"MEDICARE ALLOWED:  ${line.medicare_allowed:.2f}")
-        print("=" * 60)
-
-        if line.adjustment_reason:
-            print(f"\nNotes: {line.adjustment_reason}")
-
-        print()
-
     except ValueError as e:
         print(f"\nERROR: {e}", file=sys.stderr)
         sys.exit(1)
 
+    line = repriced.lines[0]
+
+    # Build the whole report and write it once
+    report = [
+        "",
+        "=" * 60,
+        "MEDICARE REPRICING RESULT",
+        "=" * 60,
+        f"Procedure Code:  {line.procedure_code}",
+    ]
+    if line.modifiers:
+        report.append(f"Modifier:        {', '.join(line.modifiers)}")
+    report += [
+        f"Place of Service: {line.place_of_service}",
+        f"Locality:        {line.locality}",
+        f"Units:           {line.units}",
+        "",
+        "RVU Values:",
+        f"  Work RVU:  {line.work_rvu:.4f}",
+        f"  PE RVU:    {line.pe_rvu:.4f}",
+        f"  MP RVU:    {line.mp_rvu:.4f}",
+        "",
+        "GPCI Values:",
+        f"  Work GPCI: {line.work_gpci:.4f}",
+        f"  PE GPCI:   {line.pe_gpci:.4f}",
+        f"  MP GPCI:   {line.mp_gpci:.4f}",
+        "",
+        f"Conversion Factor: ${line.conversion_factor:.4f}",
+        "",
+        f"MEDICARE ALLOWED:  ${line.medicare_allowed:.2f}",
+        "=" * 60,
+    ]
+    if line.adjustment_reason:
+        report += ["", f"Notes: {line.adjustment_reason}"]
+    report.append("")
+
+    sys.stdout.write("\n".join(report) + "\n")
+
 
 def lookup_procedure(args):
     """Look up procedure information."""
+    from medicare_repricing import MedicareRepricer
+
     repricer = MedicareRepricer()
 
-    info = repricer.get_procedure_info(args.procedure, args.modifier)
+    info = repricer.get_procedure_info(args.procedure, [args.modifier] if args.modifier else None)
 
     if info is None:
         print(f"\nERROR: Procedure code {args.procedure} not found in fee schedule", file=sys.stderr)
         sys.exit(1)
 
-    print("\n" + "=" * 60)
-    print("PROCEDURE INFORMATION")
-    print("=" * 60)
-    print(f"Code:        {info['procedure_code']}")
+    # Build the whole report and write it once
+    report = [
+        "",
+        "=" * 60,
+        "PROCEDURE INFORMATION",
+        "=" * 60,
+        f"Code:        {info['procedure_code']}",
+    ]
     if info['modifier']:
-        print(f"Modifier:    {info['modifier']}")
-    print(f"Description: {info['description']}")
-    print()
-    print("Non-Facility RVUs:")
-    print(f"  Work: {info['work_rvu_non_facility']:.4f}")
-    print(f"  PE:   {info['pe_rvu_non_facility']:.4f}")
-    print(f"  MP:   {info['mp_rvu_non_facility']:.4f}")
-    print()
-    print("Facility RVUs:")
-    print(f"  Work: {info['work_rvu_facility']:.4f}")
-    print(f"  PE:   {info['pe_rvu_facility']:.4f}")
-    print(f"  MP:   {info['mp_rvu_facility']:.4f}")
-    print()
-    print(f"MPPR Indicator: {info['mppr_indicator']}")
-    print(f"Conversion Factor: ${info['conversion_factor']:.4f}")
-    print("=" * 60)
-    print()
+        report.append(f"Modifier:    {info['modifier']}")
+    report += [
+        f"Description: {info['description']}",
+        "",
+        "Non-Facility RVUs:",
+        f"  Work: {info['work_rvu_non_facility']:.4f}",
+        f"  PE:   {info['pe_rvu_non_facility']:.4f}",
+        f"  MP:   {info['mp_rvu_non_facility']:.4f}",
+        "",
+        "Facility RVUs:",
+        f"  Work: {info['work_rvu_facility']:.4f}",
+        f"  PE:   {info['pe_rvu_facility']:.4f}",
+        f"  MP:   {info['mp_rvu_facility']:.4f}",
+        "",
+        f"MPPR Indicator: {info['mppr_indicator']}",
+        f"Conversion Factor: ${info['conversion_factor']:.4f}",
+        "=" * 60,
+        "",
+    ]
+
+    sys.stdout.write("\n".join(report) + "\n")
 
 
 def lookup_locality(args):
     """Look up locality information."""
+    from medicare_repricing import MedicareRepricer
+
     repricer = MedicareRepricer()
 
     info = repricer.get_locality_info(args.locality)
@@ -114,18 +136,24 @@ def lookup_locality(args):
         print(f"\nERROR: Locality {args.locality} not found", file=sys.stderr)
         sys.exit(1)
 
-    print("\n" + "=" * 60)
-    print("LOCALITY INFORMATION")
-    print("=" * 60)
-    print(f"Locality:      {info['locality']}")
-    print(f"Name:          {info['locality_name']}")
-    print()
-    print("GPCI Values:")
-    print(f"  Work GPCI: {info['work_gpci']:.4f}")
-    print(f"  PE GPCI:   {info['pe_gpci']:.4f}")
-    print(f"  MP GPCI:   {info['mp_gpci']:.4f}")
-    print("=" * 60)
-    print()
+    # Build the whole report and write it once
+    report = [
+        "",
+        "=" * 60,
+        "LOCALITY INFORMATION",
+        "=" * 60,
+        f"Locality:      {info['locality']}",
+        f"Name:          {info['locality_name']}",
+        "",
+        "GPCI Values:",
+        f"  Work GPCI: {info['work_gpci']:.4f}",
+        f"  PE GPCI:   {info['pe_gpci']:.4f}",
+        f"  MP GPCI:   {info['mp_gpci']:.4f}",
+        "=" * 60,
+        "",
+    ]
+
+    sys.stdout.write("\n".join(report) + "\n")
 
 
 def main():
@@ -13,26 +13,35 @@ Usage:
     python download_cms_data.py --year 2025 --output-dir ../data
 
 Requirements:
-    pip install pandas openpyxl requests beautifulsoup4
+    pip install pandas openpyxl
+    pip install python-calamine  # optional, faster Excel reading with pandas 2.2+
+    pip install requests  # only needed by CMSDataDownloader.download_file
 """
 
 import argparse
+import functools
+import importlib.util
 import json
+from concurrent.futures import ProcessPoolExecutor
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
 try:
+    import numpy as np
     import pandas as pd
-    import requests
-    from bs4 import BeautifulSoup
 except ImportError as e:
     print(f"Error: Missing required package: {e}")
     print("Please install required packages:")
-    print("  pip install pandas openpyxl requests beautifulsoup4")
+    print("  pip install pandas openpyxl")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +49,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bytes read per chunk when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Retries for transient HTTP failures; waits grow as 0.5s, 1s, 2s
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF_FACTOR = 0.5
+
+# The Rust-backed calamine reader is much faster than openpyxl on the large
+# CMS workbooks. It needs python-calamine and pandas 2.2+; None selects the
+# pandas default engine.
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+EXCEL_ENGINE = (
+    'calamine'
+    if _PANDAS_VERSION >= (2, 2) and importlib.util.find_spec('python_calamine') is not None
+    else None
+)
+
+# Candidate CMS column names for each parsed field, in order of preference.
+# Column names vary between CMS releases.
+RVU_COLUMNS = {
+    'procedure_code': ['HCPCS', 'CPT®/HCPCS', 'HCPCS Code'],
+    'modifier': ['MOD', 'Modifier'],
+    'description': ['Description', 'DESCRIPTION'],
+    'work_rvu': ['Work RVU', 'WORK RVU'],
+    'pe_rvu_nf': ['NON-FAC PE RVU', 'Non-Facility PE RVU'],
+    'pe_rvu_f': ['FACILITY PE RVU', 'Facility PE RVU'],
+    'mp_rvu': ['MP RVU', 'MALPRACTICE RVU'],
+    'mp_indicator': ['MULT PROC', 'Multiple Procedure'],
+}
+GPCI_COLUMNS = {
+    'locality': ['Locality', 'LOCALITY'],
+    'locality_name': ['Locality Name', 'LOCALITY NAME'],
+    'work_gpci': ['Work GPCI', 'WORK GPCI'],
+    'pe_gpci': ['PE GPCI', 'Practice Expense GPCI'],
+    'mp_gpci': ['MP GPCI', 'Malpractice GPCI'],
+}
+
+
+def _parse_memoized(parse: Callable[[Path], List[Dict]], filepath: Path) -> List[Dict]:
+    """
+    Run a file parser, reusing the result while the file is unchanged.
+
+    Results are cached in this process per resolved path and modification
+    time, so a file edited on disk is parsed again. Each call gets fresh
+    record dicts.
+
+    Args:
+        parse: Parser classmethod taking the file path
+        filepath: Path to the file to parse
+
+    Returns:
+        List of parsed record dictionaries
+    """
+    path = Path(filepath).resolve()
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        # Let the parser report the unreadable file
+        return parse(filepath)
+    return [dict(record) for record in _parse_cached(parse, str(path), mtime_ns)]
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_cached(parse: Callable[[Path], List[Dict]], path: str, mtime_ns: int) -> Tuple[Dict, ...]:
+    """Parse a file once per (parser, path, mtime); see _parse_memoized."""
+    return tuple(parse(Path(path)))
+
 
 class CMSDataDownloader:
     """Download and parse CMS Medicare fee schedule data."""
@@ -59,6 +135,35 @@ class CMSDataDownloader:
         self.year = year
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._session = None
+
+    def _get_session(self):
+        """
+        Get the HTTP session shared by all downloads, creating it on first use.
+
+        Reusing one session keeps connections to cms.gov alive between
+        downloads, and the mounted adapter retries transient failures.
+        """
+        if self._session is None:
+            # Imported here so parsing manual files does not require requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=DOWNLOAD_RETRIES,
+                backoff_factor=DOWNLOAD_BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504)
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = (
+                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            )
+            self._session = session
+        return self._session
 
     def download_file(self, url: str, filename: str) -> Optional[Path]:
         """
@@ -74,15 +179,15 @@ class CMSDataDownloader:
         filepath = self.output_dir / filename
 
         try:
-            logger.info(f"Downloading {url}...")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            session = self._get_session()
 
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            logger.info(f"Downloading {url}...")
+            # Stream to disk so only one chunk of the (large) file is in memory
+            with session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                with open(filepath, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
 
             logger.info(f"Saved to {filepath}")
             return filepath
@@ -95,6 +200,22 @@ class CMSDataDownloader:
         """
         Parse the CMS RVU Excel file.
 
+        Parsing an unchanged file again in the same process reuses the
+        previous result.
+
+        Args:
+            filepath: Path to RVU file (Excel or CSV)
+
+        Returns:
+            List of RVU data dictionaries
+        """
+        return _parse_memoized(self._parse_rvu_records, filepath)
+
+    @classmethod
+    def _parse_rvu_records(cls, filepath: Path) -> List[Dict]:
+        """
+        Parse the CMS RVU Excel file without caching.
+
         The RVU file contains columns like:
         - HCPCS Code
         - Mod (Modifier)
@@ -114,90 +235,55 @@ class CMSDataDownloader:
         logger.info(f"Parsing RVU file: {filepath}")
 
         try:
-            # Try to read as Excel first
-            if filepath.suffix in ['.xlsx', '.xls']:
-                df = pd.read_excel(filepath)
-            else:
-                df = pd.read_csv(filepath)
+            df = cls._read_table(filepath, RVU_COLUMNS)
 
             logger.info(f"Loaded {len(df)} rows from RVU file")
             logger.info(f"Columns: {df.columns.tolist()}")
 
-            rvu_data = []
-
-            # Map CMS column names to our format (adjust based on actual file)
-            # Note: Actual column names may vary - check the file
-            column_mapping = {
-                'HCPCS': 'procedure_code',
-                'CPT®/HCPCS': 'procedure_code',
-                'HCPCS Code': 'procedure_code',
-                'MOD': 'modifier',
-                'Modifier': 'modifier',
-                'Description': 'description',
-                'DESCRIPTION': 'description',
-                'Work RVU': 'work_rvu',
-                'WORK RVU': 'work_rvu',
-                'NON-FAC PE RVU': 'pe_rvu_nf',
-                'Non-Facility PE RVU': 'pe_rvu_nf',
-                'FACILITY PE RVU': 'pe_rvu_f',
-                'Facility PE RVU': 'pe_rvu_f',
-                'MP RVU': 'mp_rvu',
-                'MALPRACTICE RVU': 'mp_rvu',
-                'MULT PROC': 'mp_indicator',
-                'Multiple Procedure': 'mp_indicator',
-            }
-
             # Normalize column names
             df.columns = df.columns.str.strip()
 
-            for _, row in df.iterrows():
-                try:
-                    # Extract values with fallbacks for different column names
-                    procedure_code = None
-                    for col in ['HCPCS', 'CPT®/HCPCS', 'HCPCS Code']:
-                        if col in df.columns:
-                            procedure_code = str(row[col]).strip()
-                            break
-
-                    if not procedure_code or pd.isna(procedure_code):
-                        continue
-
-                    # Extract other fields
-                    modifier = row.get('MOD', row.get('Modifier', None))
-                    if pd.isna(modifier):
-                        modifier = None
-                    else:
-                        modifier = str(modifier).strip()
-
-                    description = str(row.get('Description', row.get('DESCRIPTION', '')))
-
-                    # RVU values
-                    work_rvu = self._parse_float(row.get('Work RVU', row.get('WORK RVU', 0)))
-                    pe_rvu_nf = self._parse_float(row.get('NON-FAC PE RVU', row.get('Non-Facility PE RVU', 0)))
-                    pe_rvu_f = self._parse_float(row.get('FACILITY PE RVU', row.get('Facility PE RVU', 0)))
-                    mp_rvu = self._parse_float(row.get('MP RVU', row.get('MALPRACTICE RVU', 0)))
-
-                    # Multiple procedure indicator
-                    mp_indicator = self._parse_int(row.get('MULT PROC', row.get('Multiple Procedure', 0)))
-
-                    rvu_entry = {
-                        'procedure_code': procedure_code,
-                        'modifier': modifier,
-                        'description': description[:200],  # Truncate long descriptions
-                        'work_rvu_nf': work_rvu,
-                        'pe_rvu_nf': pe_rvu_nf,
-                        'mp_rvu_nf': mp_rvu,
-                        'work_rvu_f': work_rvu,
-                        'pe_rvu_f': pe_rvu_f,
-                        'mp_rvu_f': mp_rvu,
-                        'mp_indicator': mp_indicator
-                    }
-
-                    rvu_data.append(rvu_entry)
-
-                except Exception as e:
-                    logger.warning(f"Error parsing row: {e}")
-                    continue
+            # Resolve each field's column once; CMS column names vary by release
+            code_col = cls._find_column(df, RVU_COLUMNS['procedure_code'])
+            if code_col is None:
+                logger.info("Parsed 0 RVU entries")
+                return []
+
+            # Drop rows without a procedure code
+            procedure_codes = cls._string_column(df, [code_col]).str.strip()
+            valid = procedure_codes.notna() & (procedure_codes != '')
+            dropped = int((~valid).sum())
+            if dropped:
+                logger.warning(f"Dropped {dropped} rows without a procedure code")
+            df = df[valid]
+
+            modifiers = cls._string_column(df, RVU_COLUMNS['modifier'])
+            if modifiers is None:
+                modifiers = pd.Series([None] * len(df), index=df.index, dtype=object)
+            else:
+                modifiers = modifiers.str.strip().astype(object).where(modifiers.notna(), None)
+
+            descriptions = cls._string_column(df, RVU_COLUMNS['description'])
+            if descriptions is None:
+                descriptions = pd.Series('', index=df.index, dtype=object)
+
+            # RVU values
+            work_rvu = cls._float_column(df, RVU_COLUMNS['work_rvu'], 0.0)
+            mp_rvu = cls._float_column(df, RVU_COLUMNS['mp_rvu'], 0.0)
+
+            rvu_data = pd.DataFrame({
+                'procedure_code': procedure_codes[valid],
+                'modifier': modifiers,
+                'description': descriptions.fillna('').str.slice(0, 200),  # Truncate long descriptions
+                'work_rvu_nf': work_rvu,
+                'pe_rvu_nf': cls._float_column(df, RVU_COLUMNS['pe_rvu_nf'], 0.0),
+                'mp_rvu_nf': mp_rvu,
+                'work_rvu_f': work_rvu,
+                'pe_rvu_f': cls._float_column(df, RVU_COLUMNS['pe_rvu_f'], 0.0),
+                'mp_rvu_f': mp_rvu,
+                # Multiple procedure indicator
+                'mp_indicator': cls._int_column(df, RVU_COLUMNS['mp_indicator'], 0),
+            }).to_dict(orient='records')
 
             logger.info(f"Parsed {len(rvu_data)} RVU entries")
             return rvu_data
@@ -210,6 +296,22 @@ class CMSDataDownloader:
         """
         Parse the CMS GPCI file.
 
+        Parsing an unchanged file again in the same process reuses the
+        previous result.
+
+        Args:
+            filepath: Path to GPCI file
+
+        Returns:
+            List of GPCI data dictionaries
+        """
+        return _parse_memoized(self._parse_gpci_records, filepath)
+
+    @classmethod
+    def _parse_gpci_records(cls, filepath: Path) -> List[Dict]:
+        """
+        Parse the CMS GPCI file without caching.
+
         The GPCI file contains columns like:
         - Locality
         - Locality Name
@@ -226,43 +328,37 @@ class CMSDataDownloader:
         logger.info(f"Parsing GPCI file: {filepath}")
 
         try:
-            if filepath.suffix in ['.xlsx', '.xls']:
-                df = pd.read_excel(filepath)
-            else:
-                df = pd.read_csv(filepath)
+            df = cls._read_table(filepath, GPCI_COLUMNS)
 
             logger.info(f"Loaded {len(df)} rows from GPCI file")
             logger.info(f"Columns: {df.columns.tolist()}")
 
-            gpci_data = []
-
             # Normalize column names
             df.columns = df.columns.str.strip()
 
-            for _, row in df.iterrows():
-                try:
-                    locality = str(row.get('Locality', row.get('LOCALITY', ''))).strip()
-                    if not locality or pd.isna(locality):
-                        continue
-
-                    locality_name = str(row.get('Locality Name', row.get('LOCALITY NAME', '')))
-                    work_gpci = self._parse_float(row.get('Work GPCI', row.get('WORK GPCI', 1.0)))
-                    pe_gpci = self._parse_float(row.get('PE GPCI', row.get('Practice Expense GPCI', 1.0)))
-                    mp_gpci = self._parse_float(row.get('MP GPCI', row.get('Malpractice GPCI', 1.0)))
-
-                    gpci_entry = {
-                        'locality': locality,
-                        'locality_name': locality_name,
-                        'work_gpci': work_gpci,
-                        'pe_gpci': pe_gpci,
-                        'mp_gpci': mp_gpci
-                    }
-
-                    gpci_data.append(gpci_entry)
-
-                except Exception as e:
-                    logger.warning(f"Error parsing GPCI row: {e}")
-                    continue
+            # Drop rows without a locality
+            localities = cls._string_column(df, GPCI_COLUMNS['locality'])
+            if localities is None:
+                logger.info("Parsed 0 GPCI entries")
+                return []
+            localities = localities.str.strip()
+            valid = localities.notna() & (localities != '')
+            dropped = int((~valid).sum())
+            if dropped:
+                logger.warning(f"Dropped {dropped} rows without a locality")
+            df = df[valid]
+
+            locality_names = cls._string_column(df, GPCI_COLUMNS['locality_name'])
+            if locality_names is None:
+                locality_names = pd.Series('', index=df.index, dtype=object)
+
+            gpci_data = pd.DataFrame({
+                'locality': localities[valid],
+                'locality_name': locality_names.fillna(''),
+                'work_gpci': cls._float_column(df, GPCI_COLUMNS['work_gpci'], 1.0),
+                'pe_gpci': cls._float_column(df, GPCI_COLUMNS['pe_gpci'], 1.0),
+                'mp_gpci': cls._float_column(df, GPCI_COLUMNS['mp_gpci'], 1.0),
+            }).to_dict(orient='records')
 
             logger.info(f"Parsed {len(gpci_data)} GPCI entries")
             return gpci_data
@@ -271,23 +367,75 @@ class CMSDataDownloader:
             logger.error(f"Failed to parse GPCI file: {e}")
             return []
 
-    def _parse_float(self, value) -> float:
-        """Parse a float value, handling various formats."""
-        try:
-            if pd.isna(value):
-                return 0.0
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-
-    def _parse_int(self, value) -> int:
-        """Parse an integer value, handling various formats."""
-        try:
-            if pd.isna(value):
-                return 0
-            return int(float(value))
-        except (ValueError, TypeError):
-            return 0
+    @staticmethod
+    def _read_table(filepath: Path, columns: Dict[str, List[str]]) -> "pd.DataFrame":
+        """
+        Read an Excel or CSV file, loading only the columns that are parsed.
+
+        Every cell is read as a string so codes keep their leading zeros and
+        pandas skips type inference; numeric fields are converted afterwards.
+
+        Args:
+            filepath: Path to the Excel or CSV file
+            columns: Candidate column names for each parsed field
+
+        Returns:
+            DataFrame with the matching columns
+        """
+        wanted = {name for candidates in columns.values() for name in candidates}
+
+        def usecols(col) -> bool:
+            return str(col).strip() in wanted
+
+        # Try to read as Excel first
+        if filepath.suffix in ['.xlsx', '.xls']:
+            return pd.read_excel(filepath, usecols=usecols, dtype=str, engine=EXCEL_ENGINE)
+        return pd.read_csv(filepath, usecols=usecols, dtype=str)
+
+    @staticmethod
+    def _find_column(df: "pd.DataFrame", candidates: List[str]) -> Optional[str]:
+        """Return the first candidate column name present in the dataframe."""
+        return next((col for col in candidates if col in df.columns), None)
+
+    @classmethod
+    def _string_column(cls, df: "pd.DataFrame", candidates: List[str]) -> Optional["pd.Series"]:
+        """
+        Get a column as strings, keeping missing values as NA.
+
+        Returns None if none of the candidate columns exist.
+        """
+        col = cls._find_column(df, candidates)
+        if col is None:
+            return None
+        values = df[col]
+        return values.astype(str).where(values.notna())
+
+    @classmethod
+    def _float_column(cls, df: "pd.DataFrame", candidates: List[str], default: float) -> "pd.Series":
+        """
+        Get a numeric column as floats.
+
+        Missing or unparseable values become 0.0; if none of the candidate
+        columns exist every row gets the default.
+        """
+        col = cls._find_column(df, candidates)
+        if col is None:
+            return pd.Series(default, index=df.index, dtype=float)
+        return pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(float)
+
+    @classmethod
+    def _int_column(cls, df: "pd.DataFrame", candidates: List[str], default: int) -> "pd.Series":
+        """
+        Get a numeric column as integers, truncating fractional values.
+
+        Missing, unparseable or infinite values become 0; if none of the
+        candidate columns exist every row gets the default.
+        """
+        col = cls._find_column(df, candidates)
+        if col is None:
+            return pd.Series(default, index=df.index, dtype=int)
+        values = pd.to_numeric(df[col], errors='coerce')
+        return values.where(np.isfinite(values), 0).astype(int)
 
     def save_json(self, data: List[Dict], filename: str) -> Path:
         """
@@ -301,8 +449,11 @@ class CMSDataDownloader:
             Path to saved file
         """
         filepath = self.output_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
         logger.info(f"Saved {len(data)} entries to {filepath}")
         return filepath
 
@@ -313,23 +464,39 @@ class CMSDataDownloader:
         Use this if automatic download fails. Download files from:
         https://www.cms.gov/medicare/payment/fee-schedules/physician/pfs-relative-value-files/rvu25a
 
+        When both files are given they are parsed in two worker processes.
+        That path bypasses the in-process parse memo, since results cached in
+        short-lived workers would never be reused.
+
         Args:
             rvu_file: Path to downloaded RVU file
             gpci_file: Optional path to downloaded GPCI file
         """
         logger.info("Processing manually downloaded files...")
 
-        # Parse RVU file
-        if rvu_file.exists():
-            rvu_data = self.parse_rvu_file(rvu_file)
+        have_rvu = rvu_file.exists()
+        have_gpci = bool(gpci_file and gpci_file.exists())
+
+        if have_rvu and have_gpci:
+            # Parsing is CPU-bound pandas work, so parse both files on separate cores
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                rvu_future = executor.submit(self._parse_rvu_records, rvu_file)
+                gpci_future = executor.submit(self._parse_gpci_records, gpci_file)
+                rvu_data = rvu_future.result()
+                gpci_data = gpci_future.result()
+        else:
+            rvu_data = self.parse_rvu_file(rvu_file) if have_rvu else None
+            gpci_data = self.parse_gpci_file(gpci_file) if have_gpci else None
+
+        # Save RVU data
+        if have_rvu:
             if rvu_data:
                 self.save_json(rvu_data, 'rvu_data.json')
         else:
             logger.error(f"RVU file not found: {rvu_file}")
 
-        # Parse GPCI file if provided
-        if gpci_file and gpci_file.exists():
-            gpci_data = self.parse_gpci_file(gpci_file)
+        # Save GPCI data if provided
+        if have_gpci:
             if gpci_data:
                 self.save_json(gpci_data, 'gpci_data.json')
         else:
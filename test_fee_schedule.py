@@ -0,0 +1,180 @@
+"""
+Tests for Medicare fee schedule data loading.
+
+Run with: pytest test_fee_schedule.py -v
+"""
+
+import json
+import os
+
+import pytest
+from medicare_repricing.fee_schedule import MedicareFeeSchedule, OPPSData, RVUData, GPCIData, AnesthesiaData
+
+
+SAMPLE_RVUS = [
+    {
+        "procedure_code": "99213",
+        "modifier": None,
+        "description": "Office visit, established patient, moderate",
+        "work_rvu_nf": 0.97, "pe_rvu_nf": 1.57, "mp_rvu_nf": 0.09,
+        "work_rvu_f": 0.97, "pe_rvu_f": 1.18, "mp_rvu_f": 0.09,
+        "mp_indicator": 0,
+    },
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Directory holding a minimal rvu_data.json."""
+    (tmp_path / "rvu_data.json").write_text(json.dumps(SAMPLE_RVUS))
+    return tmp_path
+
+
+class TestLoadFromDirectory:
+    """Test loading fee schedule data files."""
+
+    def test_loads_rvu_data(self, data_dir):
+        """Test RVU records are loaded and keyed by procedure code."""
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.load_from_directory(data_dir)
+
+        rvu = fee_schedule.get_rvu("99213")
+        assert rvu is not None
+        assert rvu.work_rvu_nf == 0.97
+        assert rvu.mp_indicator == 0
+
+    def test_cache_written_and_reused(self, data_dir):
+        """Test the pickle cache is created and used on the next load."""
+        cache_dir = data_dir / "cache"
+        MedicareFeeSchedule().load_from_directory(data_dir, cache_dir=cache_dir)
+        cache_file = cache_dir / "rvu_data.cache.pkl"
+        assert cache_file.exists()
+        assert not list(cache_dir.glob("*.tmp"))
+
+        cached_mtime = cache_file.stat().st_mtime_ns
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.load_from_directory(data_dir, cache_dir=cache_dir)
+
+        assert cache_file.stat().st_mtime_ns == cached_mtime
+        assert fee_schedule.get_rvu("99213") is not None
+
+    def test_no_cache_by_default(self, data_dir):
+        """Test nothing is written to the data directory without a cache_dir."""
+        MedicareFeeSchedule().load_from_directory(data_dir)
+
+        assert sorted(p.name for p in data_dir.iterdir()) == ["rvu_data.json"]
+
+    def test_unwritable_cache_dir_is_skipped(self, data_dir):
+        """Test loading still works when the cache directory cannot be created."""
+        blocker = data_dir / "not_a_directory"
+        blocker.write_text("")
+
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.load_from_directory(data_dir, cache_dir=blocker / "cache")
+
+        assert fee_schedule.get_rvu("99213") is not None
+
+    def test_stale_cache_is_rebuilt(self, data_dir):
+        """Test a modified JSON file invalidates the cache."""
+        cache_dir = data_dir / "cache"
+        MedicareFeeSchedule().load_from_directory(data_dir, cache_dir=cache_dir)
+
+        updated = [dict(SAMPLE_RVUS[0], work_rvu_nf=1.25)]
+        rvu_file = data_dir / "rvu_data.json"
+        rvu_file.write_text(json.dumps(updated))
+        stat = rvu_file.stat()
+        os.utime(rvu_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.load_from_directory(data_dir, cache_dir=cache_dir)
+
+        assert fee_schedule.get_rvu("99213").work_rvu_nf == 1.25
+
+    def test_cache_disabled(self, data_dir):
+        """Test no cache is written when caching is disabled."""
+        cache_dir = data_dir / "cache"
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.load_from_directory(data_dir, use_cache=False, cache_dir=cache_dir)
+
+        assert fee_schedule.get_rvu("99213") is not None
+        assert not cache_dir.exists()
+
+
+class TestOPPSLookup:
+    """Test OPPS price lookups."""
+
+    def _fee_schedule(self):
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.add_opps(OPPSData("0633T", None, "A", "01112", "05", 100.0, 150.0))
+        fee_schedule.add_opps(OPPSData("0633T", "TC", "A", "01112", "05", 40.0, 60.0))
+        return fee_schedule
+
+    def test_exact_modifier_match(self):
+        """Test a modifier-specific entry is preferred."""
+        opps = self._fee_schedule().get_opps("0633T", "TC", "01112", "05")
+        assert opps.modifier == "TC"
+
+    def test_falls_back_to_no_modifier(self):
+        """Test an unknown modifier falls back to the base entry."""
+        opps = self._fee_schedule().get_opps("0633T", "26", "01112", "05")
+        assert opps.modifier is None
+        assert opps.facility_price == 100.0
+
+    def test_requires_carrier_and_locality(self):
+        """Test lookups without carrier/locality return None."""
+        assert self._fee_schedule().get_opps("0633T") is None
+
+
+class TestRowLookup:
+    """Test tuple row lookups for RVU and GPCI data."""
+
+    def test_rvu_row_matches_rvu(self):
+        """Test RVU rows mirror get_rvu, including modifier fallback."""
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.add_rvu(RVUData("71046", None, "Chest x-ray", 0.22, 0.6, 0.02, 0.22, 0.6, 0.02))
+        fee_schedule.add_rvu(RVUData("71046", "26", "Chest x-ray", 0.22, 0.1, 0.02, 0.22, 0.1, 0.02, 2))
+
+        assert fee_schedule.get_rvu_row("71046", "26") == fee_schedule.get_rvu("71046", "26").as_row()
+        assert fee_schedule.get_rvu_row("71046", "TC") == fee_schedule.get_rvu("71046").as_row()
+        assert fee_schedule.get_rvu_row("99999") is None
+
+    def test_rvu_rows_batch_matches_single(self):
+        """Test batch RVU row lookups match get_rvu_row pair by pair."""
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.add_rvu(RVUData("71046", None, "Chest x-ray", 0.22, 0.6, 0.02, 0.22, 0.6, 0.02))
+        fee_schedule.add_rvu(RVUData("71046", "26", "Chest x-ray", 0.22, 0.1, 0.02, 0.22, 0.1, 0.02, 2))
+
+        keys = [("71046", "26"), ("71046", "TC"), ("71046", None), ("99999", "26")]
+
+        assert fee_schedule.get_rvu_rows(keys) == [fee_schedule.get_rvu_row(*key) for key in keys]
+
+    def test_rows_refresh_after_add(self):
+        """Test rows pick up data added after the first lookup."""
+        fee_schedule = MedicareFeeSchedule()
+        assert fee_schedule.get_gpci_row("01") is None
+
+        fee_schedule.add_gpci(GPCIData("01", "Manhattan", 1.05, 1.2, 1.5))
+
+        assert fee_schedule.get_gpci_row("01") == (1.05, 1.2, 1.5, "Manhattan")
+
+
+class TestAnesthesiaContractorLookup:
+    """Test the locality to anesthesia contractor index."""
+
+    def test_first_contractor_wins(self):
+        """Test the first contractor added for a locality is returned."""
+        fee_schedule = MedicareFeeSchedule()
+        fee_schedule.add_anesthesia(AnesthesiaData("01112", "05", "San Francisco", 22.0))
+        fee_schedule.add_anesthesia(AnesthesiaData("01182", "05", "San Francisco", 23.0))
+
+        assert fee_schedule.get_anesthesia_contractor("05") == "01112"
+        assert fee_schedule.get_anesthesia_contractor("99") is None
+
+    def test_index_refreshes_after_add(self):
+        """Test contractors added after the first lookup are found."""
+        fee_schedule = MedicareFeeSchedule()
+        assert fee_schedule.get_anesthesia_contractor("01") is None
+
+        fee_schedule.add_anesthesia(AnesthesiaData("13202", "01", "Manhattan", 25.0))
+
+        assert fee_schedule.get_anesthesia_contractor("01") == "13202"
@@ -6,6 +6,7 @@ This test suite validates the MS-DRG grouping functionality.
 
 import pytest
 from pathlib import Path
+from pydantic import ValidationError
 from medicare_repricing import MSDRGGrouper, GrouperInput
 
 
@@ -301,6 +302,176 @@ def test_invalid_diagnosis():
     assert "not found" in result.error_messages[0].lower()
 
 
+def test_repeated_input_is_memoized():
+    """Test that identical inputs reuse the cached grouping result."""
+    grouper = MSDRGGrouper(data_directory=Path("data"))
+
+    def group(procedures):
+        return grouper.assign_drg(GrouperInput(
+            principal_diagnosis="I50.9",
+            secondary_diagnoses=["N17.9"],
+            procedures=procedures,
+            age=68,
+            sex="F"
+        ))
+
+    first = group(["02703ZZ", "0SR9019"])
+    # Procedure order does not affect grouping, so this hits the cache too
+    second = group(["0SR9019", "02703ZZ"])
+
+    assert second is first
+    assert len(grouper._drg_memo) == 1
+
+    grouper.clear_cache()
+    assert group(["02703ZZ", "0SR9019"]) is not first
+
+    # Shared results cannot be modified by one caller under another
+    with pytest.raises(ValidationError):
+        first.ms_drg = "000"
+    assert isinstance(first.mcc_list, tuple)
+
+
+def test_grouper_is_freed_without_cycle_collection():
+    """Test that the result memo does not keep its grouper alive."""
+    import gc
+    import weakref
+
+    grouper = MSDRGGrouper(data_directory=Path("data"))
+    grouper.assign_drg(GrouperInput(principal_diagnosis="I50.9", age=68, sex="F"))
+    ref = weakref.ref(grouper)
+
+    gc.disable()
+    try:
+        del grouper
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_batch_matches_single_claim_grouping():
+    """Test that batch grouping returns the same result as assign_drg per claim."""
+    import pandas as pd
+
+    grouper = MSDRGGrouper(data_directory=Path("data"))
+    claims = pd.DataFrame([
+        {"principal_diagnosis": "I50.9", "secondary_diagnoses": ["N17.9"],
+         "procedures": None, "age": 68, "sex": "F"},
+        {"principal_diagnosis": "J44.1", "secondary_diagnoses": ["A41.9", "I50.9"],
+         "procedures": ["0SR9019"], "age": 75, "sex": "M"},
+        {"principal_diagnosis": "T86.10", "secondary_diagnoses": None,
+         "procedures": ["02703ZZ"], "age": 55, "sex": "M"},
+        {"principal_diagnosis": "INVALID", "secondary_diagnoses": [],
+         "procedures": [], "age": 50, "sex": "M"},
+    ], index=["a", "b", "c", "d"])
+
+    # The second frame has no CCs or MCCs at all, which changes inferred dtypes
+    for frame in (claims, claims.loc[["c", "d"]]):
+        result = grouper.assign_drg_batch(frame)
+
+        assert list(result.index) == list(frame.index)
+        for label, claim in frame.iterrows():
+            expected = grouper.assign_drg(GrouperInput(**claim.to_dict()))
+            row = result.loc[label]
+            assert row["ms_drg"] == expected.ms_drg
+            assert row["drg_type"] == expected.drg_type
+            assert row["has_mcc"] == expected.has_mcc
+            assert row["has_cc"] == expected.has_cc
+            assert row["mdc"] == expected.mdc
+            assert row["mcc_list"] == expected.mcc_list
+            assert row["cc_list"] == expected.cc_list
+            assert row["relative_weight"] == expected.relative_weight
+            assert row["geometric_mean_los"] == expected.geometric_mean_los
+            assert row["arithmetic_mean_los"] == expected.arithmetic_mean_los
+            assert row["warning_messages"] == expected.warning_messages
+            assert row["error_messages"] == expected.error_messages
+
+
+def test_assign_drg_code_matches_assign_drg():
+    """Test that the code-only API agrees with the full grouping result."""
+    grouper = MSDRGGrouper(data_directory=Path("data"))
+
+    for input_data in (
+        GrouperInput(principal_diagnosis="I50.23", secondary_diagnoses=["E87.5", "N17.9"],
+                     age=75, sex="F"),
+        GrouperInput(principal_diagnosis="M16.11", secondary_diagnoses=["I10"],
+                     procedures=["0SR9019"], age=72, sex="F"),
+        GrouperInput(principal_diagnosis="INVALID", age=50, sex="M"),
+    ):
+        assert grouper.assign_drg_code(input_data) == grouper.assign_drg(input_data).ms_drg
+
+
+def test_cc_mcc_flags_stop_at_first_mcc():
+    """Test that CC/MCC detection stops scanning at the first MCC."""
+    grouper = MSDRGGrouper(data_directory=Path("data"))
+    scanned = []
+
+    def secondary_diagnoses():
+        # I10 is neither, N17.9 is an MCC, E87.5 is a CC
+        for code in ["I10", "N17.9", "E87.5"]:
+            scanned.append(code)
+            yield code
+
+    has_mcc, _ = grouper._determine_cc_mcc_flags(secondary_diagnoses())
+
+    assert has_mcc
+    assert scanned == ["I10", "N17.9"]
+    assert grouper._determine_cc_mcc_flags(["I10", "E87.5"]) == (False, True)
+
+
+def _copy_grouper_data(directory: Path) -> Path:
+    """Copy the grouper data files into a scratch directory."""
+    import shutil
+
+    for name in ("icd10_cm_data.json", "icd10_pcs_data.json", "mdc_definitions.json",
+                 "drg_grouping_rules.json", "ms_drg_data.json"):
+        shutil.copy(Path("data") / name, directory / name)
+    return directory
+
+
+def test_data_cache_reused(tmp_path):
+    """Test that built grouper data is cached and reused across instances."""
+    data_dir = _copy_grouper_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    input_data = GrouperInput(
+        principal_diagnosis="I50.9",
+        secondary_diagnoses=["N17.9"],
+        age=68,
+        sex="F"
+    )
+    first = MSDRGGrouper(data_directory=data_dir, cache_dir=cache_dir)
+    assert (cache_dir / "grouper_data.cache.pkl").exists()
+    assert not list(cache_dir.glob("*.tmp"))
+
+    # A fresh process would not have the in-process shared state
+    MSDRGGrouper._shared_data.pop(data_dir.resolve())
+    second = MSDRGGrouper(data_directory=data_dir, cache_dir=cache_dir)
+    assert len(second.diagnosis_lookup) == len(first.diagnosis_lookup)
+    assert second.assign_drg(input_data) == first.assign_drg(input_data)
+
+
+def test_data_shared_between_instances(tmp_path):
+    """Test that instances for the same directory share their lookup tables."""
+    data_dir = _copy_grouper_data(tmp_path)
+    first = MSDRGGrouper.warm(data_dir)
+    second = MSDRGGrouper(data_directory=data_dir.resolve())
+
+    assert second.diagnosis_lookup is first.diagnosis_lookup
+    assert second.grouping_rules is first.grouping_rules
+    assert MSDRGGrouper(data_directory=data_dir, use_cache=False).diagnosis_lookup \
+        is not first.diagnosis_lookup
+    # No cache_dir, so nothing is written next to the data
+    assert not list(data_dir.glob("*.cache.pkl"))
+
+
+def test_data_cache_disabled(tmp_path):
+    """Test that no cache file is written when caching is disabled."""
+    data_dir = _copy_grouper_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    MSDRGGrouper(data_directory=data_dir, use_cache=False, cache_dir=cache_dir)
+    assert not cache_dir.exists()
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
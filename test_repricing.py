@@ -4,8 +4,10 @@ Tests for Medicare repricing functionality.
 Run with: pytest test_repricing.py -v
 """
 
+import json
+
 import pytest
-from medicare_repricing import MedicareRepricer, Claim, ClaimLine
+from medicare_repricing import MedicareRepricer, Claim, ClaimLine, RepricedClaim
 
 
 class TestBasicRepricing:
@@ -106,6 +108,38 @@ class TestBasicRepricing:
 
         assert abs(repriced_triple.total_allowed - (repriced_single.total_allowed * 3)) < 0.01
 
+    def test_repriced_claim_is_valid(self):
+        """Test that unvalidated output models still pass model validation."""
+        repricer = MedicareRepricer()
+
+        claim = Claim(
+            claim_id="TEST004",
+            lines=[
+                ClaimLine(
+                    line_number=1,
+                    procedure_code="99213",
+                    modifiers=None,
+                    place_of_service="11",
+                    locality="00",
+                    units=1
+                ),
+                ClaimLine(
+                    line_number=2,
+                    procedure_code="INVALID",
+                    modifiers=None,
+                    place_of_service="11",
+                    locality="00",
+                    units=1
+                )
+            ]
+        )
+
+        repriced = repricer.reprice_claim(claim)
+        dumped = repriced.model_dump()
+
+        assert RepricedClaim.model_validate(dumped).model_dump() == dumped
+        assert repriced.notes
+
 
 class TestGeographicAdjustment:
     """Test geographic GPCI adjustments."""
@@ -309,6 +343,27 @@ class TestMPPR:
         # Should have MPPR note
         assert "MPPR" in " ".join(repriced.notes)
 
+    def test_mppr_ranking_large_claim(self, monkeypatch):
+        """Test that large claims rank procedures the same as small ones."""
+        import medicare_repricing.repricer as repricer_module
+
+        repricer = MedicareRepricer()
+        codes = ["12001", "12002", "99213", "12001", "12004", "INVALID", "12002"] * 4
+        lines = [
+            ClaimLine(
+                line_number=i + 1,
+                procedure_code=code,
+                place_of_service="22" if i % 3 else "11",
+                locality="00"
+            )
+            for i, code in enumerate(codes)
+        ]
+
+        ranks = repricer._identify_mppr_procedures(lines)
+        monkeypatch.setattr(repricer_module, "_VECTORIZED_MPPR_MIN_LINES", len(lines) + 1)
+
+        assert repricer._identify_mppr_procedures(lines) == ranks
+
 
 class TestValidation:
     """Test claim validation."""
@@ -334,6 +389,35 @@ class TestValidation:
         with pytest.raises(ValueError, match="Claim ID"):
             repricer.reprice_claim(claim)
 
+    def test_duplicate_line_numbers(self):
+        """Test that duplicate line numbers raise error during repricing."""
+        repricer = MedicareRepricer()
+
+        claim = Claim(
+            claim_id="TEST009",
+            lines=[
+                ClaimLine(
+                    line_number=1,
+                    procedure_code="99213",
+                    modifiers=None,
+                    place_of_service="11",
+                    locality="00",
+                    units=1
+                ),
+                ClaimLine(
+                    line_number=1,
+                    procedure_code="80053",
+                    modifiers=None,
+                    place_of_service="11",
+                    locality="00",
+                    units=1
+                )
+            ]
+        )
+
+        with pytest.raises(ValueError, match="unique"):
+            repricer.reprice_claim(claim)
+
     def test_invalid_procedure_code(self):
         """Test handling of unknown procedure code."""
         repricer = MedicareRepricer()
@@ -359,6 +443,140 @@ class TestValidation:
         assert repriced.lines[0].medicare_allowed == 0.0
 
 
+class TestBulkRepricing:
+    """Test vectorized batch repricing."""
+
+    def test_bulk_matches_reprice_claims(self):
+        """Test that bulk repricing returns the same results as reprice_claims."""
+        repricer = MedicareRepricer()
+
+        claims = [
+            Claim(
+                claim_id="BULK001",
+                lines=[
+                    ClaimLine(line_number=1, procedure_code="12002", place_of_service="11", locality="01"),
+                    ClaimLine(line_number=2, procedure_code="12001", modifiers=["50"], place_of_service="22", locality="00", units=2),
+                    ClaimLine(line_number=3, procedure_code="71046", modifiers=["26", "52"], place_of_service="11", locality="ZZ"),
+                ]
+            ),
+            Claim(
+                claim_id="BULK002",
+                lines=[
+                    ClaimLine(line_number=1, procedure_code="99213", place_of_service="11", locality="00"),
+                    ClaimLine(line_number=2, procedure_code="INVALID", place_of_service="11", locality="00"),
+                ]
+            ),
+            Claim(
+                claim_id="BULK003",
+                lines=[
+                    ClaimLine(line_number=1, procedure_code="99214", modifiers=["TC"], place_of_service="11", locality="05"),
+                ]
+            ),
+        ]
+
+        expected = repricer.reprice_claims(claims)
+        actual = repricer.reprice_claims_bulk(claims)
+
+        assert [c.claim_id for c in actual] == ["BULK001", "BULK002", "BULK003"]
+        for exp, act in zip(expected, actual):
+            assert act.model_dump(exclude={"repricing_date"}) == exp.model_dump(exclude={"repricing_date"})
+
+    def test_bulk_validates_claims(self):
+        """Test that bulk repricing rejects invalid claims."""
+        repricer = MedicareRepricer()
+
+        claim = Claim(
+            claim_id="",
+            lines=[ClaimLine(line_number=1, procedure_code="99213", place_of_service="11", locality="00")]
+        )
+
+        with pytest.raises(ValueError):
+            repricer.reprice_claims_bulk([claim])
+
+
+class TestJsonSerialization:
+    """Test serializing repriced claims."""
+
+    def test_to_json_bytes_matches_model_dump_json(self):
+        """Test that to_json_bytes produces the same document as pydantic."""
+        repricer = MedicareRepricer()
+
+        claim = Claim(
+            claim_id="JSON001",
+            lines=[
+                ClaimLine(line_number=1, procedure_code="99213", modifiers=["26"], place_of_service="11", locality="01"),
+                ClaimLine(line_number=2, procedure_code="INVALID", place_of_service="11", locality="01"),
+            ]
+        )
+
+        repriced = repricer.reprice_claim(claim)
+        payload = repriced.to_json_bytes()
+
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == json.loads(repriced.model_dump_json())
+
+
+class TestParallelRepricing:
+    """Test threaded batch repricing."""
+
+    def test_threaded_matches_serial(self):
+        """Test that threaded repricing returns the same results in order."""
+        claims = [
+            Claim(
+                claim_id=f"PAR{i:03d}",
+                lines=[
+                    ClaimLine(line_number=1, procedure_code="99213", place_of_service="11", locality="00", units=i % 3 + 1),
+                    ClaimLine(line_number=2, procedure_code="12002", place_of_service="22", locality="01"),
+                ]
+            )
+            for i in range(20)
+        ]
+
+        serial = MedicareRepricer().reprice_claims(claims)
+        threaded = MedicareRepricer(max_workers=4, parallel_threshold=10).reprice_claims(claims)
+
+        assert [c.claim_id for c in threaded] == [c.claim_id for c in claims]
+        for exp, act in zip(serial, threaded):
+            assert act.model_dump(exclude={"repricing_date"}) == exp.model_dump(exclude={"repricing_date"})
+
+    def test_process_pool_matches_serial(self):
+        """Test that repricing on worker processes returns the same results in order."""
+        claims = [
+            Claim(
+                claim_id=f"PROC{i:03d}",
+                lines=[
+                    ClaimLine(line_number=1, procedure_code="99213", place_of_service="11", locality="00", units=i % 3 + 1),
+                    ClaimLine(line_number=2, procedure_code="12002", place_of_service="22", zip_code="10001"),
+                ]
+            )
+            for i in range(20)
+        ]
+
+        serial = MedicareRepricer().reprice_claims(claims)
+        pooled = MedicareRepricer(max_workers=2, parallel_threshold=10, use_processes=True).reprice_claims(claims)
+
+        assert [c.claim_id for c in pooled] == [c.claim_id for c in claims]
+        for exp, act in zip(serial, pooled):
+            assert act.model_dump(exclude={"repricing_date"}) == exp.model_dump(exclude={"repricing_date"})
+
+    def test_batch_shares_repricing_date(self):
+        """Test that a batch is stamped with a single repricing date."""
+        claims = [
+            Claim(
+                claim_id=f"DATE{i:03d}",
+                lines=[ClaimLine(line_number=1, procedure_code="99213", place_of_service="11", locality="00")]
+            )
+            for i in range(5)
+        ]
+
+        repricer = MedicareRepricer()
+        for repriced in (repricer.reprice_claims(claims), repricer.reprice_claims_bulk(claims)):
+            assert len({c.repricing_date for c in repriced}) == 1
+
+        stamped = repricer.reprice_claim(claims[0], now="2024-01-01T00:00:00")
+        assert stamped.repricing_date == "2024-01-01T00:00:00"
+
+
 class TestFeeScheduleQuery:
     """Test fee schedule querying."""
 
@@ -392,6 +610,14 @@ class TestFeeScheduleQuery:
 
         assert info is None
 
+    def test_can_price(self):
+        """Test the calculator precheck for missing fee schedule data."""
+        calculator = MedicareRepricer().calculator
+
+        assert calculator.can_price("99213", "00") is None
+        assert calculator.can_price("99213", "ZZ") is None  # Falls back to national GPCI
+        assert "not found in fee schedule" in calculator.can_price("99999", "00")
+
 
 class TestMultipleModifiers:
     """Test multiple modifier handling."""
@@ -589,6 +815,38 @@ class TestZipCodeMapping:
         # Manhattan should have different allowed amount
         assert repriced_manhattan.total_allowed != repriced_national.total_allowed
 
+    def test_add_zip_mapping_updates_lookup(self):
+        """Test that adding a zip mapping is visible to later lookups."""
+        from medicare_repricing.zip_to_locality import (
+            ZIP_TO_LOCALITY, add_zip_mapping, get_locality_from_zip
+        )
+
+        assert get_locality_from_zip("94105") == "00"
+
+        add_zip_mapping("941", "26")
+        try:
+            assert get_locality_from_zip("94105") == "26"
+        finally:
+            del ZIP_TO_LOCALITY["941"]
+
+        assert get_locality_from_zip("94105") == "00"
+
+    def test_direct_zip_mapping_edits_update_lookup(self):
+        """Test that editing ZIP_TO_LOCALITY directly is visible to later lookups."""
+        from medicare_repricing.zip_to_locality import ZIP_TO_LOCALITY, get_locality_from_zip
+
+        ZIP_TO_LOCALITY["94"] = "26"
+        try:
+            assert get_locality_from_zip("94105") == "26"
+            ZIP_TO_LOCALITY.update({"941": "18"})
+            assert get_locality_from_zip("94105") == "18"
+            assert get_locality_from_zip("94205") == "26"
+        finally:
+            ZIP_TO_LOCALITY.pop("941", None)
+            del ZIP_TO_LOCALITY["94"]
+
+        assert get_locality_from_zip("94105") == "00"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])